@@ -0,0 +1,23 @@
+-- DropIndex
+DROP INDEX "modpack_versions_modpack_id_idx";
+
+-- CreateIndex
+CREATE INDEX "modpacks_is_published_mc_version_loader_idx" ON "modpacks"("is_published", "mc_version", "loader");
+
+-- CreateIndex
+CREATE INDEX "modpack_versions_modpack_id_created_at_idx" ON "modpack_versions"("modpack_id", "created_at" DESC);
+
+-- Version names weren't unique per modpack before this migration. Keep the oldest
+-- row's name and rename later duplicates to "<version>~<id>" (truncated to fit the
+-- column) so the unique index can be built without losing any versions
+UPDATE "modpack_versions" AS v
+SET "version" = left(v."version", 50 - length('~' || v."id")) || '~' || v."id"
+FROM (
+  SELECT "id",
+         row_number() OVER (PARTITION BY "modpack_id", "version" ORDER BY "created_at", "id") AS rn
+  FROM "modpack_versions"
+) AS d
+WHERE v."id" = d."id" AND d.rn > 1;
+
+-- CreateIndex
+CREATE UNIQUE INDEX "modpack_versions_modpack_id_version_key" ON "modpack_versions"("modpack_id", "version");
@@ -0,0 +1,4 @@
+-- CreateIndex
+-- Expression index for full-text search on /search; Prisma can't declare it in schema.prisma,
+-- and the expression must match the one used in src/utils/search.ts
+CREATE INDEX "modpacks_fts_idx" ON "modpacks" USING GIN (to_tsvector('english', coalesce("name", '') || ' ' || coalesce("description", '')));
@@ -0,0 +1,8 @@
+-- CreateExtension
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- CreateIndex
+CREATE INDEX "modpacks_name_trgm_idx" ON "modpacks" USING GIN ("name" gin_trgm_ops);
+
+-- CreateIndex
+CREATE INDEX "modpacks_description_trgm_idx" ON "modpacks" USING GIN ("description" gin_trgm_ops);
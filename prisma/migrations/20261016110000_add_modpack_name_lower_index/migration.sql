@@ -0,0 +1,4 @@
+-- CreateIndex
+-- Supports prefix search (lower("name") LIKE 'q%'); text_pattern_ops keeps LIKE indexable
+-- regardless of the database collation
+CREATE INDEX "modpacks_name_lower_idx" ON "modpacks" (lower("name") text_pattern_ops);
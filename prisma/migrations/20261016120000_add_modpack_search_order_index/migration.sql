@@ -0,0 +1,2 @@
+-- CreateIndex
+CREATE INDEX "modpacks_is_published_downloads_id_idx" ON "modpacks"("is_published", "downloads" DESC, "id" DESC);
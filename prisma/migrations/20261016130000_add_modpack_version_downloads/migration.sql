@@ -0,0 +1,12 @@
+-- AlterTable
+ALTER TABLE "modpacks" ADD COLUMN "version_downloads" INTEGER NOT NULL DEFAULT 0;
+
+-- Backfill from existing version counts
+UPDATE "modpacks" AS m
+SET "version_downloads" = v.total
+FROM (
+  SELECT "modpack_id", SUM("downloads")::int AS total
+  FROM "modpack_versions"
+  GROUP BY "modpack_id"
+) AS v
+WHERE m."id" = v."modpack_id";
@@ -0,0 +1,2 @@
+-- CreateIndex
+CREATE INDEX "modpacks_is_published_loader_mc_version_downloads_id_idx" ON "modpacks"("is_published", "loader", "mc_version", "downloads" DESC, "id" DESC);
@@ -0,0 +1,13 @@
+-- Search only ever reads published modpacks, so the text search indexes skip drafts
+
+-- DropIndex
+DROP INDEX "modpacks_fts_idx";
+
+-- CreateIndex
+CREATE INDEX "modpacks_fts_idx" ON "modpacks" USING GIN (to_tsvector('english', coalesce("name", '') || ' ' || coalesce("description", ''))) WHERE "is_published";
+
+-- DropIndex
+DROP INDEX "modpacks_name_lower_idx";
+
+-- CreateIndex
+CREATE INDEX "modpacks_name_lower_idx" ON "modpacks" (lower("name") text_pattern_ops) WHERE "is_published";
@@ -0,0 +1,10 @@
+-- AlterTable
+-- Stored tsvector maintained by PostgreSQL, so searches no longer tokenize name and description per row
+ALTER TABLE "modpacks" ADD COLUMN "search_vector" tsvector
+  GENERATED ALWAYS AS (to_tsvector('english', coalesce("name", '') || ' ' || coalesce("description", ''))) STORED;
+
+-- DropIndex
+DROP INDEX "modpacks_fts_idx";
+
+-- CreateIndex
+CREATE INDEX "modpacks_search_vector_idx" ON "modpacks" USING GIN ("search_vector") WHERE "is_published";
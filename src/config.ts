@@ -1,18 +1,38 @@
 import 'dotenv/config';
 import { z } from 'zod';
+import { HASH_ALGORITHMS } from './utils/hash.js';
 
 const envSchema = z.object({
   DATABASE_URL: z.string().url(),
   JWT_SECRET: z.string().min(32),
   ACCESS_TOKEN_EXPIRE_MINUTES: z.coerce.number().default(30),
+  // bcrypt cost factor for password hashes; lower it only for test suites
+  BCRYPT_ROUNDS: z.coerce.number().int().min(4).max(31).default(10),
   API_HOST: z.string().default('0.0.0.0'),
   API_PORT: z.coerce.number().default(8000),
   NODE_ENV: z.enum(['development', 'production', 'test']).default('development'),
   UPLOAD_DIR: z.string().default('./uploads'),
   MAX_FILE_SIZE: z.coerce.number().default(524288000),
+  UPLOAD_HASH_ALGORITHM: z.enum(HASH_ALGORITHMS).default('sha256'),
+  // When set (e.g., "/internal-uploads/"), /uploads/* responses delegate the file
+  // transfer to the reverse proxy via X-Accel-Redirect instead of streaming it from Node
+  UPLOADS_ACCEL_REDIRECT_PREFIX: z.string().optional(),
+  // Comma-separated origins (e.g., "https://cdn.example.com") that version downloads may
+  // redirect to besides /uploads/; other download URLs are returned as JSON instead
+  DOWNLOAD_REDIRECT_ORIGINS: z.string().default(''),
   ALLOWED_ORIGINS: z.string().default('*'),
   RATE_LIMIT_MAX: z.coerce.number().default(100),
   RATE_LIMIT_TIMEWINDOW: z.string().default('1 minute'),
+  // Number of clients tracked by the in-memory rate limit store before LRU eviction
+  RATE_LIMIT_CACHE_SIZE: z.coerce.number().int().positive().default(10000),
+  // How long /search responses are cached in memory; 0 disables the cache
+  SEARCH_CACHE_TTL_SECONDS: z.coerce.number().int().min(0).default(60),
+  SEARCH_CACHE_MAX_ENTRIES: z.coerce.number().int().positive().default(1000),
+  // How long published modpack detail responses are cached in memory; 0 disables the cache
+  MODPACK_CACHE_TTL_SECONDS: z.coerce.number().int().min(0).default(300),
+  MODPACK_CACHE_MAX_ENTRIES: z.coerce.number().int().positive().default(1000),
+  // In-flight /search requests allowed per user (or IP for anonymous clients)
+  SEARCH_MAX_CONCURRENT_PER_CLIENT: z.coerce.number().int().positive().default(5),
   MEILISEARCH_HOST: z.string().url().default('http://localhost:7700'),
   // MEILISEARCH_KEY is optional for development without authentication,
   // but required for production environments where Meilisearch has auth enabled.
@@ -40,4 +40,19 @@ const start = async () => {
   }
 };
 
+// Close the server on shutdown so onClose hooks run (e.g., writing buffered download counts)
+const shutdown = async (signal: NodeJS.Signals) => {
+  server.log.info(`Received ${signal}, shutting down`);
+  try {
+    await server.close();
+    process.exit(0);
+  } catch (err) {
+    server.log.error(err);
+    process.exit(1);
+  }
+};
+
+process.once('SIGINT', shutdown);
+process.once('SIGTERM', shutdown);
+
 start();
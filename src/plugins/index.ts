@@ -6,7 +6,7 @@ import multipart from '@fastify/multipart';
 import fastifyStatic from '@fastify/static';
 import { config } from '../config.js';
 import { mkdir } from 'fs/promises';
-import { resolve } from 'path';
+import { basename, resolve } from 'path';
 
 export async function registerPlugins(server: FastifyInstance) {
   await server.register(cors, {
@@ -16,11 +16,19 @@ export async function registerPlugins(server: FastifyInstance) {
 
   await server.register(jwt, {
     secret: config.JWT_SECRET,
+    verify: {
+      // Cache verified tokens (LRU, expiry still enforced) so repeat requests
+      // with the same token skip the HMAC check and claim decoding
+      cache: 10_000,
+    },
   });
 
   await server.register(rateLimit, {
     max: config.RATE_LIMIT_MAX,
     timeWindow: config.RATE_LIMIT_TIMEWINDOW,
+    // Counters live in this process; an evicted client starts a fresh window,
+    // so size the store for the number of clients active within one window
+    cache: config.RATE_LIMIT_CACHE_SIZE,
     errorResponseBuilder: (_req, context) => ({
       statusCode: 429,
       error: 'Too Many Requests',
@@ -37,10 +45,20 @@ export async function registerPlugins(server: FastifyInstance) {
   const uploadDir = resolve(config.UPLOAD_DIR);
   await mkdir(uploadDir, { recursive: true });
 
-  await server.register(fastifyStatic, {
-    root: uploadDir,
-    prefix: '/uploads/',
-  });
+  const accelRedirectPrefix = config.UPLOADS_ACCEL_REDIRECT_PREFIX;
+  if (accelRedirectPrefix) {
+    // nginx serves the file from an internal location with sendfile(2),
+    // so upload bytes never pass through the Node process
+    server.get<{ Params: { '*': string } }>('/uploads/*', async (request, reply) => {
+      const filename = encodeURIComponent(basename(request.params['*']));
+      return reply.header('X-Accel-Redirect', `${accelRedirectPrefix}${filename}`).send();
+    });
+  } else {
+    await server.register(fastifyStatic, {
+      root: uploadDir,
+      prefix: '/uploads/',
+    });
+  }
 
   server.decorate('authenticate', async function (request, reply) {
     try {
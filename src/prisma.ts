@@ -3,6 +3,11 @@ import { PrismaClient } from '@prisma/client';
 const prismaClientSingleton = () => {
   return new PrismaClient({
     log: process.env.NODE_ENV === 'development' ? ['query', 'error', 'warn'] : ['error'],
+    // versionDownloads is bookkeeping for the detail endpoint's downloadStats;
+    // leave it out of every other modpack response
+    omit: {
+      modpack: { versionDownloads: true },
+    },
   });
 };
 
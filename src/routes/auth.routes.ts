@@ -16,8 +16,10 @@ export async function authRoutes(server: FastifyInstance) {
           { email: body.email },
         ],
       },
+      select: { id: true },
     });
 
+    // Check before hashing so rejected registrations don't cost a bcrypt round
     if (existingUser) {
       throw new AppError(400, 'Username or email already exists');
     }
@@ -6,6 +6,13 @@ import { generateSlug } from '../utils/slug.js';
 import { parseTagSlugs } from '../utils/tags.js';
 import { getLicensesByCategory, addLicenseInfo } from '../utils/license.js';
 import { indexProjectById, updateProjectInIndex, removeProjectById } from '../utils/indexing.js';
+import { invalidateSearchCache } from '../utils/search.js';
+import {
+  getCachedModpackDetail,
+  modpackDetailGeneration,
+  cacheModpackDetail,
+  invalidateModpackDetail,
+} from '../utils/modpackCache.js';
 import { modpackCreateSchema, modpackUpdateSchema, projectTypeEnum } from '../schemas/modpack.schema.js';
 
 interface ModpackParams {
@@ -81,7 +88,7 @@ export async function modpackRoutes(server: FastifyInstance) {
             },
           },
           tags: {
-            include: {
+            select: {
               tag: true,
             },
           },
@@ -93,10 +100,7 @@ export async function modpackRoutes(server: FastifyInstance) {
 
     // Transform tags to flat array and add license info
     const transformedModpacks = modpacks.map((modpack) => 
-      addLicenseInfo({
-        ...modpack,
-        tags: modpack.tags.map((pt) => pt.tag),
-      })
+      addLicenseInfo(modpack, { tags: modpack.tags.map((pt) => pt.tag) })
     );
 
     return reply.send({
@@ -115,8 +119,16 @@ export async function modpackRoutes(server: FastifyInstance) {
     async (request: FastifyRequest<{ Params: ModpackParams }>, reply: FastifyReply) => {
       const { slug } = request.params;
 
+      const cached = getCachedModpackDetail(slug);
+      if (cached) {
+        return reply.type('application/json').send(cached);
+      }
+
+      const generation = modpackDetailGeneration(slug);
       const modpack = await prisma.modpack.findUnique({
         where: { slug },
+        // Omitted from modpacks by default; reported under downloadStats below
+        omit: { versionDownloads: false },
         include: {
           author: {
             select: {
@@ -125,11 +137,12 @@ export async function modpackRoutes(server: FastifyInstance) {
             },
           },
           versions: {
-            orderBy: { createdAt: 'desc' },
+            orderBy: [{ createdAt: 'desc' }, { id: 'desc' }],
             take: 10,
           },
+          // Only the tag rows are returned, so skip the join-table columns
           tags: {
-            include: {
+            select: {
               tag: true,
             },
           },
@@ -148,12 +161,22 @@ export async function modpackRoutes(server: FastifyInstance) {
       }
 
       // Transform tags to flat array and add license info
-      const transformedModpack = addLicenseInfo({
-        ...modpack,
+      const { versionDownloads, ...modpackFields } = modpack;
+      const transformedModpack = addLicenseInfo(modpackFields, {
         tags: modpack.tags.map((pt) => pt.tag),
+        // Kept as a running total on the modpack; only the latest versions are loaded above
+        downloadStats: {
+          totalDownloads: modpack.downloads,
+          versionDownloads,
+        },
       });
 
-      return reply.send(transformedModpack);
+      const payload = JSON.stringify(transformedModpack);
+      if (modpack.isPublished) {
+        cacheModpackDetail(slug, payload, generation);
+      }
+
+      return reply.type('application/json').send(payload);
     }
   );
 
@@ -198,6 +221,8 @@ export async function modpackRoutes(server: FastifyInstance) {
         },
       });
 
+      invalidateSearchCache();
+
       // Index the project in search (async, non-blocking)
       // Note: indexProjectById checks if project is published before indexing
       indexProjectById(modpack.id).catch((err) => {
@@ -256,6 +281,10 @@ export async function modpackRoutes(server: FastifyInstance) {
         },
       });
 
+      invalidateSearchCache();
+      invalidateModpackDetail(slug);
+      invalidateModpackDetail(updatedModpack.slug);
+
       // Update the project in search index (async, non-blocking)
       updateProjectInIndex(updatedModpack.id).catch((err) => {
         server.log.error(err, 'Failed to update project in search index');
@@ -288,6 +317,9 @@ export async function modpackRoutes(server: FastifyInstance) {
         where: { slug },
       });
 
+      invalidateSearchCache();
+      invalidateModpackDetail(slug);
+
       // Remove the project from search index (async, non-blocking)
       removeProjectById(modpack.id).catch((err) => {
         server.log.error(err, 'Failed to remove project from search index');
@@ -18,7 +18,7 @@ export async function projectRoutes(server: FastifyInstance) {
 
       const user = await prisma.user.findUnique({
         where: { username },
-        select: { id: true },
+        select: { id: true, username: true },
       });
 
       if (!user) {
@@ -42,19 +42,14 @@ export async function projectRoutes(server: FastifyInstance) {
 
       const modpacks = await prisma.modpack.findMany({
         where,
-        include: {
-          author: {
-            select: {
-              id: true,
-              username: true,
-            },
-          },
-        },
         orderBy: { createdAt: 'desc' },
       });
 
-      // Add license info to each modpack
-      const transformedModpacks = modpacks.map(addLicenseInfo);
+      // Every project here has the same author, which was already loaded above,
+      // so attach it directly instead of joining users again
+      const transformedModpacks = modpacks.map((modpack) =>
+        addLicenseInfo(modpack, { author: user })
+      );
 
       return reply.send(transformedModpacks);
     }
@@ -2,114 +2,204 @@ import { FastifyInstance, FastifyRequest, FastifyReply } from 'fastify';
 import { Prisma } from '@prisma/client';
 import { prisma } from '../prisma.js';
 import { projectTypeEnum } from '../schemas/modpack.schema.js';
+import { modpackSearchResponseJsonSchema } from '../schemas/search.schema.js';
 import { parseTagSlugs } from '../utils/tags.js';
 import { getLicensesByCategory, addLicenseInfo } from '../utils/license.js';
+import { AppError } from '../utils/errors.js';
+import { userOrIpKey } from '../utils/rateLimit.js';
+import { concurrencyLimit } from '../utils/concurrency.js';
+import { config } from '../config.js';
+import {
+  ModpackSearchFilters,
+  SEARCH_MODES,
+  SearchMode,
+  SEARCH_SORTS,
+  SearchSort,
+  isRankedSearch,
+  isSearchQueryTooShort,
+  MIN_SEARCH_QUERY_LENGTH,
+  searchModpackIds,
+  decodeSearchCursor,
+  searchCacheKey,
+  getCachedSearchResponse,
+  cacheSearchResponse,
+} from '../utils/search.js';
+
+// Columns returned for each search result; everything else on the row is left in the database
+const searchResultSelect = {
+  id: true,
+  name: true,
+  slug: true,
+  description: true,
+  projectType: true,
+  mcVersion: true,
+  loader: true,
+  loaderVersion: true,
+  downloads: true,
+  licenseId: true,
+  licenseUrl: true,
+  createdAt: true,
+  updatedAt: true,
+  author: {
+    select: {
+      id: true,
+      username: true,
+    },
+  },
+  tags: {
+    select: {
+      tag: {
+        select: {
+          id: true,
+          name: true,
+          slug: true,
+          type: true,
+          color: true,
+          icon: true,
+        },
+      },
+    },
+  },
+} satisfies Prisma.ModpackSelect;
 
 export async function searchRoutes(server: FastifyInstance) {
-  server.get('/search', async (request: FastifyRequest, reply: FastifyReply) => {
-    const { q, mcVersion, loader, type, tags, license, licenseCategory, page = 1, limit = 20 } = request.query as {
-      q?: string;
-      mcVersion?: string;
-      loader?: string;
-      type?: string;
-      tags?: string;
-      license?: string;
-      licenseCategory?: string;
-      page?: number;
-      limit?: number;
-    };
-
-    // Validate pagination parameters with reasonable limits
-    const pageNum = Math.max(1, Number(page) || 1);
-    const limitNum = Math.min(100, Math.max(1, Number(limit) || 20));
-
-    const skip = (pageNum - 1) * limitNum;
-    const take = limitNum;
-
-    const where: Prisma.ModpackWhereInput = { isPublished: true };
-
-    if (q) {
-      where.OR = [
-        { name: { contains: q, mode: 'insensitive' } },
-        { description: { contains: q, mode: 'insensitive' } },
-      ];
-    }
+  const searchConcurrency = concurrencyLimit(config.SEARCH_MAX_CONCURRENT_PER_CLIENT, userOrIpKey);
 
-    if (mcVersion) where.mcVersion = mcVersion;
-    if (loader) where.loader = loader;
-    if (type) {
-      const parsed = projectTypeEnum.safeParse(type.toUpperCase());
-      if (parsed.success) {
-        where.projectType = parsed.data;
+  server.get(
+    '/search',
+    {
+      config: { rateLimit: { keyGenerator: userOrIpKey } },
+      schema: { response: { 200: modpackSearchResponseJsonSchema } },
+      ...searchConcurrency,
+    },
+    async (request: FastifyRequest, reply: FastifyReply) => {
+      const { q, mode = 'fts', sort = 'downloads', mcVersion, loader, type, tags, license, licenseCategory, page = 1, limit = 20, cursor } = request.query as {
+        q?: string;
+        mode?: string;
+        sort?: string;
+        mcVersion?: string;
+        loader?: string;
+        type?: string;
+        tags?: string;
+        license?: string;
+        licenseCategory?: string;
+        page?: number;
+        limit?: number;
+        cursor?: string;
+      };
+
+      // Validate pagination parameters with reasonable limits
+      const pageNum = Math.max(1, Number(page) || 1);
+      const limitNum = Math.min(100, Math.max(1, Number(limit) || 20));
+
+      const skip = (pageNum - 1) * limitNum;
+      const take = limitNum;
+
+      if (!SEARCH_MODES.includes(mode as SearchMode)) {
+        throw new AppError(400, `Invalid search mode. Must be one of: ${SEARCH_MODES.join(', ')}`);
       }
-    }
 
-    // Filter by license category (permissive, copyleft, etc.)
-    // Note: licenseCategory takes precedence over license if both are provided
-    if (licenseCategory) {
-      const licensesInCategory = getLicensesByCategory(licenseCategory);
-      if (licensesInCategory.length > 0) {
-        where.licenseId = { in: licensesInCategory };
+      if (!SEARCH_SORTS.includes(sort as SearchSort)) {
+        throw new AppError(400, `Invalid sort. Must be one of: ${SEARCH_SORTS.join(', ')}`);
       }
-    } else if (license) {
-      // Filter by specific license (only if licenseCategory is not provided)
-      where.licenseId = license;
-    }
 
-    // Filter by tags (comma-separated slugs)
-    // Uses OR filtering: returns projects that have ANY of the provided tags
-    if (tags) {
-      const tagSlugs = parseTagSlugs(tags).filter(s => s.length > 0);
-      if (tagSlugs.length > 0) {
-        where.tags = {
-          some: {
-            tag: {
-              slug: { in: tagSlugs },
-            },
-          },
-        };
+      // Blank queries mean no text filter; very short ones would match nearly every row
+      const query = q?.trim() || undefined;
+      if (query && isSearchQueryTooShort(query)) {
+        throw new AppError(
+          400,
+          `Search query must be at least ${MIN_SEARCH_QUERY_LENGTH} characters`
+        );
       }
-    }
 
-    const [modpacks, total] = await Promise.all([
-      prisma.modpack.findMany({
-        where,
-        skip,
-        take,
-        include: {
-          author: {
-            select: {
-              id: true,
-              username: true,
-            },
-          },
-          tags: {
-            include: {
-              tag: true,
-            },
-          },
-        },
-        orderBy: [{ downloads: 'desc' }, { createdAt: 'desc' }],
-      }),
-      prisma.modpack.count({ where }),
-    ]);
-
-    // Transform tags to flat array and add license info
-    const transformedModpacks = modpacks.map((modpack) => 
-      addLicenseInfo({
-        ...modpack,
-        tags: modpack.tags.map((pt) => pt.tag),
-      })
-    );
-
-    return reply.send({
-      data: transformedModpacks,
-      pagination: {
-        page: pageNum,
-        limit: limitNum,
-        total,
-        pages: Math.ceil(total / limitNum),
-      },
-    });
-  });
+      const filters: ModpackSearchFilters = {
+        q: query,
+        mode: mode as SearchMode,
+        sort: sort as SearchSort,
+        mcVersion,
+        loader,
+      };
+
+      // A cursor from a previous page seeks past its last result instead of using page/offset
+      const after = cursor ? decodeSearchCursor(cursor) : undefined;
+      if (after === null) {
+        throw new AppError(400, 'Invalid cursor');
+      }
+      if (after && isRankedSearch(filters)) {
+        throw new AppError(400, 'Cursor pagination is not supported for ranked searches');
+      }
+
+      if (type) {
+        const parsed = projectTypeEnum.safeParse(type.toUpperCase());
+        if (parsed.success) {
+          filters.projectType = parsed.data;
+        }
+      }
+
+      // Filter by license category (permissive, copyleft, etc.)
+      // Note: licenseCategory takes precedence over license if both are provided
+      if (licenseCategory) {
+        const licensesInCategory = getLicensesByCategory(licenseCategory);
+        if (licensesInCategory.length > 0) {
+          filters.licenseIds = licensesInCategory;
+        }
+      } else if (license) {
+        // Filter by specific license (only if licenseCategory is not provided)
+        filters.licenseIds = [license];
+      }
+
+      // Filter by tags (comma-separated slugs)
+      // Uses OR filtering: returns projects that have ANY of the provided tags
+      if (tags) {
+        const tagSlugs = parseTagSlugs(tags).filter(s => s.length > 0);
+        if (tagSlugs.length > 0) {
+          filters.tagSlugs = tagSlugs;
+        }
+      }
+
+      // Popular queries are served from memory; writes to modpacks and tags clear the cache
+      const cacheKey = searchCacheKey(filters, { page: pageNum, limit: limitNum, cursor });
+      const cached = getCachedSearchResponse(cacheKey);
+      if (cached) {
+        return reply.type('application/json').send(cached);
+      }
+
+      // Match and paginate in SQL, then load the page's rows with their relations
+      const { ids, total, hasMore, nextCursor } = await searchModpackIds(filters, { take, skip, after });
+
+      // Skip the second round trip when nothing matched (e.g., a page past the end)
+      const rows = ids.length === 0 ? [] : await prisma.modpack.findMany({
+        where: { id: { in: ids } },
+        select: searchResultSelect,
+      });
+
+      // Restore the search order, which findMany doesn't preserve for an ID list
+      const rowsById = new Map(rows.map((row) => [row.id, row]));
+      const modpacks = ids.flatMap((id) => rowsById.get(id) ?? []);
+
+      // Transform tags to flat array and add license info
+      const transformedModpacks = modpacks.map((modpack) => 
+        addLicenseInfo(modpack, { tags: modpack.tags.map((pt) => pt.tag) })
+      );
+
+      // Serialize once with the compiled response schema and cache the resulting JSON
+      const payload = reply.serialize({
+        data: transformedModpacks,
+        pagination:
+          total === null
+            ? { limit: limitNum, hasMore, nextCursor }
+            : {
+                page: pageNum,
+                limit: limitNum,
+                total,
+                pages: Math.ceil(total / limitNum),
+                hasMore,
+                nextCursor,
+              },
+      });
+      cacheSearchResponse(cacheKey, payload);
+
+      return reply.type('application/json').send(payload);
+    }
+  );
 }
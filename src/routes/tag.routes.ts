@@ -2,6 +2,8 @@ import { FastifyInstance, FastifyRequest, FastifyReply } from 'fastify';
 import { prisma } from '../prisma.js';
 import { AppError } from '../utils/errors.js';
 import { generateSlug } from '../utils/slug.js';
+import { invalidateSearchCache } from '../utils/search.js';
+import { invalidateModpackDetail, invalidateAllModpackDetails } from '../utils/modpackCache.js';
 import {
   tagCreateSchema,
   tagUpdateSchema,
@@ -128,6 +130,8 @@ export async function tagRoutes(server: FastifyInstance) {
           ...(body.icon !== undefined && { icon: body.icon }),
         },
       });
+      invalidateSearchCache();
+      invalidateAllModpackDetails();
 
       return reply.send(updatedTag);
     }
@@ -156,6 +160,8 @@ export async function tagRoutes(server: FastifyInstance) {
       await prisma.tag.delete({
         where: { id: tagId },
       });
+      invalidateSearchCache();
+      invalidateAllModpackDetails();
 
       return reply.code(204).send();
     }
@@ -219,6 +225,8 @@ export async function tagRoutes(server: FastifyInstance) {
           },
         });
       });
+      invalidateSearchCache();
+      invalidateModpackDetail(slug);
 
       return reply.send(updatedModpack);
     }
@@ -270,6 +278,8 @@ export async function tagRoutes(server: FastifyInstance) {
           },
         },
       });
+      invalidateSearchCache();
+      invalidateModpackDetail(slug);
 
       return reply.code(204).send();
     }
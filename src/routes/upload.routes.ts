@@ -1,17 +1,32 @@
 import { FastifyInstance, FastifyRequest, FastifyReply } from 'fastify';
 import { pipeline } from 'stream/promises';
 import { createWriteStream } from 'fs';
+import { unlink } from 'fs/promises';
 import { join } from 'path';
 import { randomUUID } from 'crypto';
 import { config } from '../config.js';
 import { AppError } from '../utils/errors.js';
+import { HashStream } from '../utils/hash.js';
+
+// Buffer up to 1 MiB on each side of the upload pipeline so the file
+// stream backs up less often and queued chunks reach disk in one writev
+const UPLOAD_CHUNK_SIZE = 1 << 20;
+
+// Room for multipart boundaries and part headers on top of the file itself
+const MULTIPART_OVERHEAD_ALLOWANCE = 1 << 20;
 
 export async function uploadRoutes(server: FastifyInstance) {
   server.post(
     '/upload',
     { onRequest: [server.authenticate] },
     async (request: FastifyRequest, reply: FastifyReply) => {
-      const data = await request.file();
+      // Reject bodies that are declared too large before anything is written to disk
+      const contentLength = Number(request.headers['content-length']);
+      if (contentLength > config.MAX_FILE_SIZE + MULTIPART_OVERHEAD_ALLOWANCE) {
+        throw new AppError(413, 'File too large');
+      }
+
+      const data = await request.file({ fileHwm: UPLOAD_CHUNK_SIZE });
 
       if (!data) {
         throw new AppError(400, 'No file uploaded');
@@ -34,14 +49,29 @@ export async function uploadRoutes(server: FastifyInstance) {
       const filename = `${randomUUID()}.${ext}`;
       const filepath = join(config.UPLOAD_DIR, filename);
 
-      await pipeline(data.file, createWriteStream(filepath));
+      const hashStream = new HashStream(config.UPLOAD_HASH_ALGORITHM, {
+        highWaterMark: UPLOAD_CHUNK_SIZE,
+      });
+      try {
+        await pipeline(
+          data.file,
+          hashStream,
+          createWriteStream(filepath, { highWaterMark: UPLOAD_CHUNK_SIZE })
+        );
+      } catch (error) {
+        // Don't leave partial files behind (e.g., size limit hit or client aborted)
+        await unlink(filepath).catch(() => undefined);
+        throw error;
+      }
 
+      const hash = hashStream.digest();
       const fileUrl = `/uploads/${filename}`;
 
       return reply.send({
         filename,
         url: fileUrl,
         mimetype: data.mimetype,
+        hash,
       });
     }
   );
@@ -1,7 +1,17 @@
 import { FastifyInstance, FastifyRequest, FastifyReply } from 'fastify';
 import { prisma } from '../prisma.js';
-import { AppError } from '../utils/errors.js';
-import { versionCreateSchema, versionUpdateSchema } from '../schemas/version.schema.js';
+import { AppError, isUniqueConstraintError } from '../utils/errors.js';
+import {
+  recordDownload,
+  flushDownloadCounts,
+  isRedirectableDownloadUrl,
+} from '../utils/downloads.js';
+import { invalidateModpackDetail } from '../utils/modpackCache.js';
+import {
+  versionCreateSchema,
+  versionUpdateSchema,
+  versionResponseJsonSchema,
+} from '../schemas/version.schema.js';
 
 interface VersionParams {
   slug: string;
@@ -9,10 +19,21 @@ interface VersionParams {
 }
 
 export async function versionRoutes(server: FastifyInstance) {
+  // Write any buffered download counts before shutting down
+  server.addHook('onClose', async () => {
+    await flushDownloadCounts();
+  });
+
   server.get<{ Params: { slug: string } }>(
     '/modpacks/:slug/versions',
+    {
+      schema: {
+        response: { 200: { type: 'array', items: versionResponseJsonSchema } },
+      },
+    },
     async (request: FastifyRequest<{ Params: { slug: string } }>, reply: FastifyReply) => {
       const { slug } = request.params;
+      const { stableOnly } = request.query as { stableOnly?: string };
 
       const modpack = await prisma.modpack.findUnique({
         where: { slug },
@@ -30,8 +51,12 @@ export async function versionRoutes(server: FastifyInstance) {
         }
       }
 
+      // Versions are only read once the modpack is known to be visible to the caller
       const versions = await prisma.modpackVersion.findMany({
-        where: { modpackId: modpack.id },
+        where: {
+          modpackId: modpack.id,
+          ...(stableOnly === 'true' && { isStable: true }),
+        },
         orderBy: { createdAt: 'desc' },
       });
 
@@ -39,13 +64,13 @@ export async function versionRoutes(server: FastifyInstance) {
     }
   );
 
-  server.get<{ Params: { slug: string; versionId: string } }>(
-    '/modpacks/:slug/versions/:versionId',
-    async (
-      request: FastifyRequest<{ Params: { slug: string; versionId: string } }>,
-      reply: FastifyReply
-    ) => {
-      const { slug, versionId } = request.params;
+  // Static segments take precedence over :versionId, regardless of registration order
+  server.get<{ Params: { slug: string } }>(
+    '/modpacks/:slug/versions/latest',
+    { schema: { response: { 200: versionResponseJsonSchema } } },
+    async (request: FastifyRequest<{ Params: { slug: string } }>, reply: FastifyReply) => {
+      const { slug } = request.params;
+      const { stableOnly } = request.query as { stableOnly?: string };
 
       const modpack = await prisma.modpack.findUnique({
         where: { slug },
@@ -56,17 +81,52 @@ export async function versionRoutes(server: FastifyInstance) {
         throw new AppError(404, 'Modpack not found');
       }
 
+      if (!modpack.isPublished) {
+        const payload = request.user as { sub: number } | undefined;
+        if (!payload || payload.sub !== modpack.authorId) {
+          throw new AppError(404, 'Modpack not found');
+        }
+      }
+
       const version = await prisma.modpackVersion.findFirst({
         where: {
-          id: Number(versionId),
           modpackId: modpack.id,
+          ...(stableOnly === 'true' && { isStable: true }),
         },
+        orderBy: [{ createdAt: 'desc' }, { id: 'desc' }],
       });
 
       if (!version) {
         throw new AppError(404, 'Version not found');
       }
 
+      return reply.send(version);
+    }
+  );
+
+  server.get<{ Params: { slug: string; versionId: string } }>(
+    '/modpacks/:slug/versions/:versionId',
+    { schema: { response: { 200: versionResponseJsonSchema } } },
+    async (
+      request: FastifyRequest<{ Params: { slug: string; versionId: string } }>,
+      reply: FastifyReply
+    ) => {
+      const { slug, versionId: versionIdStr } = request.params;
+      const versionId = parseInt(versionIdStr, 10);
+
+      if (isNaN(versionId)) {
+        throw new AppError(400, 'Invalid version ID');
+      }
+
+      const modpack = await prisma.modpack.findUnique({
+        where: { slug },
+        select: { id: true, isPublished: true, authorId: true },
+      });
+
+      if (!modpack) {
+        throw new AppError(404, 'Modpack not found');
+      }
+
       if (!modpack.isPublished) {
         const payload = request.user as { sub: number } | undefined;
         if (!payload || payload.sub !== modpack.authorId) {
@@ -74,13 +134,67 @@ export async function versionRoutes(server: FastifyInstance) {
         }
       }
 
+      const version = await prisma.modpackVersion.findFirst({
+        where: { id: versionId, modpackId: modpack.id },
+      });
+
+      if (!version) {
+        throw new AppError(404, 'Version not found');
+      }
+
       return reply.send(version);
     }
   );
 
+  server.get<{ Params: { slug: string; versionId: string } }>(
+    '/modpacks/:slug/versions/:versionId/download',
+    async (
+      request: FastifyRequest<{ Params: { slug: string; versionId: string } }>,
+      reply: FastifyReply
+    ) => {
+      const { slug, versionId: versionIdStr } = request.params;
+      const versionId = parseInt(versionIdStr, 10);
+
+      if (isNaN(versionId)) {
+        throw new AppError(400, 'Invalid version ID');
+      }
+
+      const modpack = await prisma.modpack.findUnique({
+        where: { slug },
+        select: { id: true, isPublished: true },
+      });
+
+      if (!modpack || !modpack.isPublished) {
+        throw new AppError(404, 'Modpack not found');
+      }
+
+      const version = await prisma.modpackVersion.findFirst({
+        where: { id: versionId, modpackId: modpack.id },
+        select: { id: true, downloadUrl: true },
+      });
+
+      if (!version || !version.downloadUrl) {
+        throw new AppError(404, 'Version not found');
+      }
+
+      // Counted in memory and flushed in batches to keep writes off the download path
+      recordDownload(modpack.id, version.id);
+
+      if (!isRedirectableDownloadUrl(version.downloadUrl, request.hostname)) {
+        // Hand the URL to the client rather than redirecting to a site we don't control
+        return reply.send({ url: version.downloadUrl });
+      }
+
+      return reply.redirect(version.downloadUrl);
+    }
+  );
+
   server.post<{ Params: { slug: string } }>(
     '/modpacks/:slug/versions',
-    { onRequest: [server.authenticate] },
+    {
+      onRequest: [server.authenticate],
+      schema: { response: { 201: versionResponseJsonSchema } },
+    },
     async (request: FastifyRequest<{ Params: { slug: string } }>, reply: FastifyReply) => {
       const payload = request.user as { sub: number };
       const { slug } = request.params;
@@ -99,33 +213,61 @@ export async function versionRoutes(server: FastifyInstance) {
         throw new AppError(403, 'Not authorized to create versions for this modpack');
       }
 
-      const version = await prisma.modpackVersion.create({
-        data: {
-          modpackId: modpack.id,
-          version: body.version,
-          mcVersion: body.mcVersion,
-          loader: body.loader,
-          loaderVersion: body.loaderVersion,
-          changelog: body.changelog,
-          downloadUrl: body.downloadUrl,
-          fileSize: body.fileSize,
-          isStable: body.isStable,
-        },
+      const existingVersion = await prisma.modpackVersion.findUnique({
+        where: { modpackId_version: { modpackId: modpack.id, version: body.version } },
+        select: { id: true },
       });
 
+      if (existingVersion) {
+        throw new AppError(400, 'A version with this name already exists');
+      }
+
+      let version;
+      try {
+        version = await prisma.modpackVersion.create({
+          data: {
+            modpackId: modpack.id,
+            version: body.version,
+            mcVersion: body.mcVersion,
+            loader: body.loader,
+            loaderVersion: body.loaderVersion,
+            changelog: body.changelog,
+            downloadUrl: body.downloadUrl,
+            fileSize: body.fileSize,
+            isStable: body.isStable,
+          },
+        });
+      } catch (error) {
+        // A concurrent request created the same version after the check above
+        if (isUniqueConstraintError(error)) {
+          throw new AppError(400, 'A version with this name already exists');
+        }
+        throw error;
+      }
+      invalidateModpackDetail(slug);
+
       return reply.code(201).send(version);
     }
   );
 
   server.patch<{ Params: { slug: string; versionId: string } }>(
     '/modpacks/:slug/versions/:versionId',
-    { onRequest: [server.authenticate] },
+    {
+      onRequest: [server.authenticate],
+      schema: { response: { 200: versionResponseJsonSchema } },
+    },
     async (
       request: FastifyRequest<{ Params: { slug: string; versionId: string } }>,
       reply: FastifyReply
     ) => {
       const payload = request.user as { sub: number };
-      const { slug, versionId } = request.params;
+      const { slug, versionId: versionIdStr } = request.params;
+      const versionId = parseInt(versionIdStr, 10);
+
+      if (isNaN(versionId)) {
+        throw new AppError(400, 'Invalid version ID');
+      }
+
       const body = versionUpdateSchema.parse(request.body);
 
       const modpack = await prisma.modpack.findUnique({
@@ -141,21 +283,43 @@ export async function versionRoutes(server: FastifyInstance) {
         throw new AppError(403, 'Not authorized to update this version');
       }
 
-      const version = await prisma.modpackVersion.findFirst({
+      const version = await prisma.modpackVersion.findUnique({
         where: {
-          id: Number(versionId),
+          id: versionId,
           modpackId: modpack.id,
         },
+        select: { version: true },
       });
 
       if (!version) {
         throw new AppError(404, 'Version not found');
       }
 
-      const updatedVersion = await prisma.modpackVersion.update({
-        where: { id: Number(versionId) },
-        data: body,
-      });
+      if (body.version && body.version !== version.version) {
+        const existingVersion = await prisma.modpackVersion.findUnique({
+          where: { modpackId_version: { modpackId: modpack.id, version: body.version } },
+          select: { id: true },
+        });
+
+        if (existingVersion) {
+          throw new AppError(400, 'A version with this name already exists');
+        }
+      }
+
+      let updatedVersion;
+      try {
+        updatedVersion = await prisma.modpackVersion.update({
+          where: { id: versionId },
+          data: body,
+        });
+      } catch (error) {
+        // A concurrent request took the new name after the check above
+        if (isUniqueConstraintError(error)) {
+          throw new AppError(400, 'A version with this name already exists');
+        }
+        throw error;
+      }
+      invalidateModpackDetail(slug);
 
       return reply.send(updatedVersion);
     }
@@ -169,7 +333,12 @@ export async function versionRoutes(server: FastifyInstance) {
       reply: FastifyReply
     ) => {
       const payload = request.user as { sub: number };
-      const { slug, versionId } = request.params;
+      const { slug, versionId: versionIdStr } = request.params;
+      const versionId = parseInt(versionIdStr, 10);
+
+      if (isNaN(versionId)) {
+        throw new AppError(400, 'Invalid version ID');
+      }
 
       const modpack = await prisma.modpack.findUnique({
         where: { slug },
@@ -184,20 +353,32 @@ export async function versionRoutes(server: FastifyInstance) {
         throw new AppError(403, 'Not authorized to delete this version');
       }
 
-      const version = await prisma.modpackVersion.findFirst({
+      const version = await prisma.modpackVersion.findUnique({
         where: {
-          id: Number(versionId),
+          id: versionId,
           modpackId: modpack.id,
         },
+        select: { id: true },
       });
 
       if (!version) {
         throw new AppError(404, 'Version not found');
       }
 
-      await prisma.modpackVersion.delete({
-        where: { id: Number(versionId) },
-      });
+      // Subtract the version's downloads as of the delete itself, so counts flushed
+      // after the lookup above are taken back out of the modpack's running total too
+      await prisma.$executeRaw`
+        WITH deleted AS (
+          DELETE FROM "modpack_versions"
+          WHERE "id" = ${versionId}
+          RETURNING "modpack_id", "downloads"
+        )
+        UPDATE "modpacks" AS m
+        SET "version_downloads" = m."version_downloads" - d."downloads"
+        FROM deleted AS d
+        WHERE m."id" = d."modpack_id"
+      `;
+      invalidateModpackDetail(slug);
 
       return reply.code(204).send();
     }
@@ -96,6 +96,70 @@ export const searchResponseSchema = z.object({
 
 export type SearchResponse = z.infer<typeof searchResponseSchema>;
 
+const nullableString = { type: ['string', 'null'] } as const;
+
+// JSON Schema for GET /search responses; Fastify compiles it into a dedicated
+// serializer (fast-json-stringify) instead of falling back to JSON.stringify
+export const modpackSearchResponseJsonSchema = {
+  type: 'object',
+  properties: {
+    data: {
+      type: 'array',
+      items: {
+        type: 'object',
+        properties: {
+          id: { type: 'integer' },
+          name: { type: 'string' },
+          slug: { type: 'string' },
+          description: nullableString,
+          projectType: { type: 'string' },
+          mcVersion: { type: 'string' },
+          loader: { type: 'string' },
+          loaderVersion: nullableString,
+          downloads: { type: 'integer' },
+          licenseId: nullableString,
+          licenseName: nullableString,
+          licenseUrl: nullableString,
+          createdAt: { type: 'string', format: 'date-time' },
+          updatedAt: { type: 'string', format: 'date-time' },
+          author: {
+            type: 'object',
+            properties: {
+              id: { type: 'integer' },
+              username: { type: 'string' },
+            },
+          },
+          tags: {
+            type: 'array',
+            items: {
+              type: 'object',
+              properties: {
+                id: { type: 'integer' },
+                name: { type: 'string' },
+                slug: { type: 'string' },
+                type: { type: 'string' },
+                color: nullableString,
+                icon: nullableString,
+              },
+            },
+          },
+        },
+      },
+    },
+    pagination: {
+      type: 'object',
+      properties: {
+        page: { type: 'integer' },
+        limit: { type: 'integer' },
+        total: { type: 'integer' },
+        pages: { type: 'integer' },
+        hasMore: { type: 'boolean' },
+        nextCursor: nullableString,
+      },
+    },
+  },
+} as const;
+
 /**
  * Parse filter string into Meilisearch filter format
  * Input: "loader:forge,projectType:MOD,minDownloads:1000"
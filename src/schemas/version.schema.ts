@@ -1,12 +1,19 @@
 import { z } from 'zod';
 
+// An absolute URL, or a path returned by POST /upload (e.g., "/uploads/<file>")
+const downloadUrlSchema = z
+  .string()
+  .max(512)
+  .url()
+  .or(z.string().max(512).regex(/^\/uploads\/[^/\\]+$/, 'Invalid upload path'));
+
 export const versionCreateSchema = z.object({
   version: z.string().min(1).max(50),
   mcVersion: z.string().min(1).max(20),
   loader: z.string().min(1).max(20),
   loaderVersion: z.string().max(50).optional(),
   changelog: z.string().optional(),
-  downloadUrl: z.string().url().max(512).optional(),
+  downloadUrl: downloadUrlSchema.optional(),
   fileSize: z.number().int().positive().optional(),
   isStable: z.boolean().default(true),
 });
@@ -17,7 +24,7 @@ export const versionUpdateSchema = z.object({
   loader: z.string().min(1).max(20).optional(),
   loaderVersion: z.string().max(50).optional(),
   changelog: z.string().optional(),
-  downloadUrl: z.string().url().max(512).optional(),
+  downloadUrl: downloadUrlSchema.optional(),
   fileSize: z.number().int().positive().optional(),
   isStable: z.boolean().optional(),
 });
@@ -40,3 +47,23 @@ export const versionResponseSchema = z.object({
 export type VersionCreate = z.infer<typeof versionCreateSchema>;
 export type VersionUpdate = z.infer<typeof versionUpdateSchema>;
 export type VersionResponse = z.infer<typeof versionResponseSchema>;
+
+// JSON Schema for version responses; Fastify compiles it into a dedicated
+// serializer (fast-json-stringify) instead of falling back to JSON.stringify
+export const versionResponseJsonSchema = {
+  type: 'object',
+  properties: {
+    id: { type: 'integer' },
+    modpackId: { type: 'integer' },
+    version: { type: 'string' },
+    mcVersion: { type: 'string' },
+    loader: { type: 'string' },
+    loaderVersion: { type: ['string', 'null'] },
+    changelog: { type: ['string', 'null'] },
+    downloadUrl: { type: ['string', 'null'] },
+    fileSize: { type: ['integer', 'null'] },
+    downloads: { type: 'integer' },
+    isStable: { type: 'boolean' },
+    createdAt: { type: 'string', format: 'date-time' },
+  },
+} as const;
@@ -0,0 +1,61 @@
+interface CacheEntry<V> {
+  value: V;
+  expiresAt: number;
+}
+
+/**
+ * In-process cache with a fixed time-to-live and a cap on the number of entries
+ * When full, the least recently written entry is evicted
+ * A TTL of 0 disables the cache
+ */
+export class TtlCache<V> {
+  private readonly entries = new Map<string, CacheEntry<V>>();
+
+  constructor(
+    private readonly ttlMs: number,
+    private readonly maxEntries: number
+  ) {}
+
+  get(key: string): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      return undefined;
+    }
+
+    if (entry.expiresAt <= Date.now()) {
+      this.entries.delete(key);
+      return undefined;
+    }
+
+    return entry.value;
+  }
+
+  set(key: string, value: V): void {
+    if (this.ttlMs <= 0 || this.maxEntries <= 0) {
+      return;
+    }
+
+    // Re-inserting moves the key to the end of the Map's insertion order
+    this.entries.delete(key);
+    if (this.entries.size >= this.maxEntries) {
+      const oldestKey = this.entries.keys().next().value;
+      if (oldestKey !== undefined) {
+        this.entries.delete(oldestKey);
+      }
+    }
+
+    this.entries.set(key, { value, expiresAt: Date.now() + this.ttlMs });
+  }
+
+  delete(key: string): void {
+    this.entries.delete(key);
+  }
+
+  clear(): void {
+    this.entries.clear();
+  }
+
+  get size(): number {
+    return this.entries.size;
+  }
+}
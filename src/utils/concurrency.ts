@@ -0,0 +1,47 @@
+import { FastifyRequest } from 'fastify';
+import { AppError } from './errors.js';
+
+/**
+ * Route hooks that cap how many requests each client can have in flight at once
+ * Per-minute rate limits don't stop one client from starting many slow queries
+ * at the same moment and tying up the database pool
+ * Counts are kept in this process and released when the response is sent or the client aborts
+ */
+export function concurrencyLimit(
+  max: number,
+  keyFor: (request: FastifyRequest) => Promise<string> | string
+) {
+  const active = new Map<string, number>();
+  const requestKeys = new WeakMap<FastifyRequest, string>();
+
+  async function release(request: FastifyRequest): Promise<void> {
+    const key = requestKeys.get(request);
+    if (key === undefined) {
+      return;
+    }
+    requestKeys.delete(request);
+
+    const remaining = (active.get(key) ?? 1) - 1;
+    if (remaining > 0) {
+      active.set(key, remaining);
+    } else {
+      active.delete(key);
+    }
+  }
+
+  return {
+    onRequest: async (request: FastifyRequest): Promise<void> => {
+      const key = await keyFor(request);
+      const count = active.get(key) ?? 0;
+
+      if (count >= max) {
+        throw new AppError(429, 'Too many concurrent requests');
+      }
+
+      active.set(key, count + 1);
+      requestKeys.set(request, key);
+    },
+    onResponse: release,
+    onRequestAbort: release,
+  };
+}
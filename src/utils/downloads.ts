@@ -0,0 +1,129 @@
+import { Prisma } from '@prisma/client';
+import { prisma } from '../prisma.js';
+import { config } from '../config.js';
+
+// How often buffered download counts are written to the database
+const FLUSH_INTERVAL_MS = 30_000;
+
+const pendingVersionDownloads = new Map<number, number>();
+const pendingModpackDownloads = new Map<number, number>();
+let flushTimer: NodeJS.Timeout | null = null;
+
+const downloadRedirectOrigins = config.DOWNLOAD_REDIRECT_ORIGINS.split(',')
+  .map((origin) => origin.trim())
+  .filter((origin) => origin.length > 0);
+
+/**
+ * Logger function for flush errors
+ * Uses console since the flush runs outside of any request context
+ */
+function logError(message: string, error: unknown): void {
+  // eslint-disable-next-line no-console
+  console.error(message, error);
+}
+
+function addCount(counts: Map<number, number>, id: number, amount: number): void {
+  counts.set(id, (counts.get(id) ?? 0) + amount);
+}
+
+function takeCounts(counts: Map<number, number>): Array<[number, number]> {
+  const entries = [...counts.entries()];
+  counts.clear();
+  return entries;
+}
+
+function valuesList(entries: Array<[number, number]>): Prisma.Sql {
+  return Prisma.join(entries.map(([id, count]) => Prisma.sql`(${id}::int, ${count}::int)`));
+}
+
+/**
+ * Whether a version's download URL is safe to redirect to
+ * Authors can enter any URL, so only files under /uploads/ on this host (as a path,
+ * or as an absolute URL on the hostname the request was made to) and configured origins
+ * are redirected to; anything else would be an open redirect
+ */
+export function isRedirectableDownloadUrl(
+  url: string,
+  requestHostname: string,
+  allowedOrigins: readonly string[] = downloadRedirectOrigins
+): boolean {
+  if (url.startsWith('/uploads/')) {
+    return true;
+  }
+
+  let parsed: URL;
+  try {
+    parsed = new URL(url);
+  } catch {
+    return false;
+  }
+
+  if (parsed.hostname === requestHostname && parsed.pathname.startsWith('/uploads/')) {
+    return true;
+  }
+
+  return allowedOrigins.includes(parsed.origin);
+}
+
+/**
+ * Record a download in memory
+ * Counts are written in batches by flushDownloadCounts instead of one UPDATE per request
+ */
+export function recordDownload(modpackId: number, versionId: number): void {
+  addCount(pendingModpackDownloads, modpackId, 1);
+  addCount(pendingVersionDownloads, versionId, 1);
+
+  if (!flushTimer) {
+    flushTimer = setInterval(() => {
+      flushDownloadCounts().catch((error) => logError('Failed to flush download counts:', error));
+    }, FLUSH_INTERVAL_MS);
+    // Don't keep the process alive just to flush counters
+    flushTimer.unref();
+  }
+}
+
+/**
+ * Write all buffered download counts with one UPDATE per table
+ * A modpack's version download total only grows by the counts of version rows that
+ * were actually updated, so counts buffered for a since-deleted version are dropped
+ * Versions are updated before modpacks, the same lock order as deleting a version
+ * Counts are put back into the buffer if the write fails
+ */
+export async function flushDownloadCounts(): Promise<void> {
+  const modpackCounts = takeCounts(pendingModpackDownloads);
+  const versionCounts = takeCounts(pendingVersionDownloads);
+
+  if (modpackCounts.length === 0 && versionCounts.length === 0) {
+    return;
+  }
+
+  try {
+    await prisma.$transaction([
+      prisma.$executeRaw`
+        WITH updated AS (
+          UPDATE "modpack_versions" AS v
+          SET "downloads" = v."downloads" + c.count
+          FROM (VALUES ${valuesList(versionCounts)}) AS c(id, count)
+          WHERE v."id" = c.id
+          RETURNING v."modpack_id", c.count
+        )
+        UPDATE "modpacks" AS m
+        SET "version_downloads" = m."version_downloads" + t.count
+        FROM (
+          SELECT "modpack_id", SUM(count)::int AS count FROM updated GROUP BY "modpack_id"
+        ) AS t
+        WHERE m."id" = t."modpack_id"
+      `,
+      prisma.$executeRaw`
+        UPDATE "modpacks" AS m
+        SET "downloads" = m."downloads" + c.count
+        FROM (VALUES ${valuesList(modpackCounts)}) AS c(id, count)
+        WHERE m."id" = c.id
+      `,
+    ]);
+  } catch (error) {
+    modpackCounts.forEach(([id, count]) => addCount(pendingModpackDownloads, id, count));
+    versionCounts.forEach(([id, count]) => addCount(pendingVersionDownloads, id, count));
+    throw error;
+  }
+}
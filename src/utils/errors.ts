@@ -1,4 +1,5 @@
 import { FastifyReply, FastifyRequest } from 'fastify';
+import { Prisma } from '@prisma/client';
 
 export class AppError extends Error {
   constructor(
@@ -10,6 +11,14 @@ export class AppError extends Error {
   }
 }
 
+/**
+ * Whether a Prisma error is a unique constraint violation (e.g., a concurrent insert
+ * won the race past an existence check)
+ */
+export function isUniqueConstraintError(error: unknown): boolean {
+  return error instanceof Prisma.PrismaClientKnownRequestError && error.code === 'P2002';
+}
+
 export function errorHandler(error: unknown, request: FastifyRequest, reply: FastifyReply) {
   if (error instanceof AppError) {
     return reply.code(error.statusCode).send({
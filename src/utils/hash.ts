@@ -0,0 +1,35 @@
+import { createHash, Hash } from 'crypto';
+import { Transform, TransformCallback, TransformOptions } from 'stream';
+
+// Digest algorithms accepted for uploads; all are implemented natively by OpenSSL.
+// sha256 is the default since clients verify "sha256:..." hashes.
+export const HASH_ALGORITHMS = ['sha256', 'sha512', 'blake2b512'] as const;
+
+export type HashAlgorithm = (typeof HASH_ALGORITHMS)[number];
+
+/**
+ * Pass-through stream that hashes data on its way to the destination,
+ * so uploads are digested without reading the written file back
+ * Each chunk is hashed as it arrives, so the event loop is only held for
+ * one chunk's digest at a time rather than a whole-file hash after the write
+ * Call digest() once the pipeline has finished
+ */
+export class HashStream extends Transform {
+  private readonly algorithm: HashAlgorithm;
+  private readonly hash: Hash;
+
+  constructor(algorithm: HashAlgorithm = 'sha256', options?: TransformOptions) {
+    super(options);
+    this.algorithm = algorithm;
+    this.hash = createHash(algorithm);
+  }
+
+  _transform(chunk: Buffer, _encoding: BufferEncoding, callback: TransformCallback): void {
+    this.hash.update(chunk);
+    callback(null, chunk);
+  }
+
+  digest(): string {
+    return `${this.algorithm}:${this.hash.digest('hex')}`;
+  }
+}
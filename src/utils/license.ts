@@ -168,16 +168,22 @@ export function getAllCategories(): string[] {
   return Object.keys(LICENSE_CATEGORIES);
 }
 
+type LicenseInfo = { licenseName: string | null; licenseUrl: string | null };
+
 /**
  * Transform a modpack object to include license info (licenseName and resolved licenseUrl)
+ * Fields in `overrides` (e.g., flattened tags) are applied in the same copy,
+ * so callers don't need to spread the modpack a second time
  */
-export function addLicenseInfo<T extends { licenseId: string | null; licenseUrl: string | null }>(
-  modpack: T
-): T & { licenseName: string | null; licenseUrl: string | null } {
+export function addLicenseInfo<
+  T extends { licenseId: string | null; licenseUrl: string | null },
+  O extends object = object,
+>(modpack: T, overrides?: O): Omit<T, keyof O> & O & LicenseInfo {
   const licenseDetails = modpack.licenseId ? getLicenseDetails(modpack.licenseId) : null;
   return {
     ...modpack,
+    ...overrides,
     licenseName: licenseDetails?.name ?? null,
     licenseUrl: modpack.licenseUrl ?? licenseDetails?.url ?? null,
-  };
+  } as Omit<T, keyof O> & O & LicenseInfo;
 }
@@ -0,0 +1,56 @@
+import { config } from '../config.js';
+import { TtlCache } from './cache.js';
+
+// Serialized GET /modpacks/:slug responses, keyed by slug
+// Only published modpacks are cached, since drafts are visible to their author alone
+const modpackDetailCache = new TtlCache<string>(
+  config.MODPACK_CACHE_TTL_SECONDS * 1000,
+  config.MODPACK_CACHE_MAX_ENTRIES
+);
+
+// Invalidations are numbered from one increasing counter, so a read can tell whether
+// its slug was invalidated while it was loading from the database
+let invalidationCounter = 0;
+let allInvalidatedAt = 0;
+const slugInvalidatedAt = new Map<string, number>();
+
+export function getCachedModpackDetail(slug: string): string | undefined {
+  return modpackDetailCache.get(slug);
+}
+
+/**
+ * Current generation of a slug's cached detail
+ * Take it before reading from the database and pass it to cacheModpackDetail
+ */
+export function modpackDetailGeneration(slug: string): number {
+  return Math.max(slugInvalidatedAt.get(slug) ?? 0, allInvalidatedAt);
+}
+
+/**
+ * Cache a detail response, unless the slug was invalidated since generation was taken
+ * Otherwise a read that overlapped a write (e.g., unpublishing) would cache stale data
+ */
+export function cacheModpackDetail(slug: string, payload: string, generation: number): void {
+  if (modpackDetailGeneration(slug) !== generation) {
+    return;
+  }
+  modpackDetailCache.set(slug, payload);
+}
+
+/**
+ * Drop the cached detail response for one modpack
+ * Call after writes to the modpack, its versions or its tags
+ */
+export function invalidateModpackDetail(slug: string): void {
+  slugInvalidatedAt.set(slug, ++invalidationCounter);
+  modpackDetailCache.delete(slug);
+}
+
+/**
+ * Drop every cached detail response (e.g., after a tag shared by many modpacks changes)
+ */
+export function invalidateAllModpackDetails(): void {
+  allInvalidatedAt = ++invalidationCounter;
+  slugInvalidatedAt.clear();
+  modpackDetailCache.clear();
+}
@@ -1,9 +1,8 @@
 import bcrypt from 'bcrypt';
-
-const SALT_ROUNDS = 10;
+import { config } from '../config.js';
 
 export async function hashPassword(password: string): Promise<string> {
-  return bcrypt.hash(password, SALT_ROUNDS);
+  return bcrypt.hash(password, config.BCRYPT_ROUNDS);
 }
 
 export async function verifyPassword(password: string, hash: string): Promise<boolean> {
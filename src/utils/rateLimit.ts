@@ -0,0 +1,16 @@
+import { FastifyRequest } from 'fastify';
+
+/**
+ * Rate limit key for a request: the user ID when a valid access token is sent,
+ * otherwise the client IP
+ * Users sharing an IP (NAT, mobile carriers) get their own budgets, and
+ * authenticated clients can't reset their budget by switching IPs
+ */
+export async function userOrIpKey(request: FastifyRequest): Promise<string> {
+  try {
+    await request.jwtVerify();
+    return `user:${request.user.sub}`;
+  } catch {
+    return `ip:${request.ip}`;
+  }
+}
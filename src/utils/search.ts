@@ -0,0 +1,255 @@
+import { Prisma, ProjectType } from '@prisma/client';
+import { prisma } from '../prisma.js';
+import { config } from '../config.js';
+import { TtlCache } from './cache.js';
+
+// fts: full-text search over whole words (default)
+// fuzzy: trigram matching on the name plus substring matching, for partial words and typos
+// prefix: names starting with the query, for autocomplete-style lookups
+export const SEARCH_MODES = ['fts', 'fuzzy', 'prefix'] as const;
+
+export type SearchMode = (typeof SEARCH_MODES)[number];
+
+// downloads: most downloaded first (default)
+// relevance: best full-text matches first (fts mode); fuzzy mode always ranks by name similarity
+export const SEARCH_SORTS = ['downloads', 'relevance'] as const;
+
+export type SearchSort = (typeof SEARCH_SORTS)[number];
+
+export interface ModpackSearchFilters {
+  q?: string;
+  mode?: SearchMode;
+  sort?: SearchSort;
+  mcVersion?: string;
+  loader?: string;
+  projectType?: ProjectType;
+  licenseIds?: string[];
+  tagSlugs?: string[];
+}
+
+// Fixed SQL fragments are built once. List filters bind a single array parameter
+// (= ANY) rather than one placeholder per item, so each filter combination yields
+// the same SQL text and PostgreSQL can reuse its prepared statement
+// The full-text and prefix indexes are partial (WHERE is_published), so every search
+// must include this condition for the planner to use them
+const PUBLISHED = Prisma.sql`m."is_published" = true`;
+
+// Generated column holding to_tsvector('english', name || ' ' || description), maintained by
+// PostgreSQL on write and covered by the "modpacks_search_vector_idx" GIN index
+const SEARCH_DOCUMENT = Prisma.sql`m."search_vector"`;
+
+// Must stay identical to the expression of "modpacks_name_lower_idx", or the planner
+// can't use that index for prefix searches. When it picks another index (e.g., the
+// loader/mc_version one), lower() is still evaluated per row as a filter
+const NAME_LOWER = Prisma.sql`lower(m."name")`;
+
+// Shorter queries match most of the table, especially in fuzzy and prefix modes
+export const MIN_SEARCH_QUERY_LENGTH = 3;
+
+/**
+ * Whether a trimmed text query has too few real characters to search with
+ * LIKE wildcards and whitespace don't count, since they never narrow the match
+ */
+export function isSearchQueryTooShort(q: string): boolean {
+  return q.replace(/[\s%_\\]/g, '').length < MIN_SEARCH_QUERY_LENGTH;
+}
+
+/**
+ * Escape LIKE wildcards so user input is matched literally
+ */
+export function escapeLikePattern(value: string): string {
+  return value.replace(/[\\%_]/g, '\\$&');
+}
+
+function textCondition(q: string, mode: SearchMode): Prisma.Sql {
+  if (mode === 'fuzzy') {
+    // Served by the gin_trgm_ops indexes on name and description
+    const pattern = `%${escapeLikePattern(q)}%`;
+    return Prisma.sql`(m."name" % ${q} OR m."name" ILIKE ${pattern} OR m."description" ILIKE ${pattern})`;
+  }
+
+  if (mode === 'prefix') {
+    // lower(name) LIKE 'q%' is a range scan on the lower(name) text_pattern_ops index,
+    // which ILIKE can't use
+    return Prisma.sql`${NAME_LOWER} LIKE lower(${`${escapeLikePattern(q)}%`})`;
+  }
+
+  return Prisma.sql`${SEARCH_DOCUMENT} @@ plainto_tsquery('english', ${q})`;
+}
+
+/**
+ * Build the WHERE clause for searching published modpacks
+ * Every text mode is index-backed; plain ILIKE '%q%' would read every description
+ */
+export function buildModpackSearchWhere(filters: ModpackSearchFilters): Prisma.Sql {
+  const conditions: Prisma.Sql[] = [PUBLISHED];
+
+  if (filters.q) {
+    conditions.push(textCondition(filters.q, filters.mode ?? 'fts'));
+  }
+  if (filters.mcVersion) {
+    conditions.push(Prisma.sql`m."mc_version" = ${filters.mcVersion}`);
+  }
+  if (filters.loader) {
+    conditions.push(Prisma.sql`m."loader" = ${filters.loader}`);
+  }
+  if (filters.projectType) {
+    conditions.push(Prisma.sql`m."project_type" = CAST(${filters.projectType} AS "ProjectType")`);
+  }
+  if (filters.licenseIds && filters.licenseIds.length > 0) {
+    conditions.push(Prisma.sql`m."license_id" = ANY(${filters.licenseIds}::text[])`);
+  }
+  if (filters.tagSlugs && filters.tagSlugs.length > 0) {
+    conditions.push(Prisma.sql`EXISTS (
+      SELECT 1 FROM "project_tags" AS pt
+      JOIN "tags" AS t ON t."id" = pt."tag_id"
+      WHERE pt."project_id" = m."id" AND t."slug" = ANY(${filters.tagSlugs}::text[])
+    )`);
+  }
+
+  return Prisma.join(conditions, ' AND ');
+}
+
+// Position after the last result of a page; results are ordered by (downloads, id) descending
+export interface SearchCursor {
+  downloads: number;
+  id: number;
+}
+
+/**
+ * Encode a cursor as an opaque URL-safe string
+ */
+export function encodeSearchCursor(cursor: SearchCursor): string {
+  return Buffer.from(`${cursor.downloads}.${cursor.id}`).toString('base64url');
+}
+
+/**
+ * Decode a cursor from encodeSearchCursor, or return null if it is malformed
+ */
+export function decodeSearchCursor(value: string): SearchCursor | null {
+  const match = /^(\d+)\.(\d+)$/.exec(Buffer.from(value, 'base64url').toString());
+  if (!match) {
+    return null;
+  }
+
+  const downloads = Number(match[1]);
+  const id = Number(match[2]);
+  if (!Number.isSafeInteger(downloads) || !Number.isSafeInteger(id)) {
+    return null;
+  }
+
+  return { downloads, id };
+}
+
+export interface SearchPageOptions {
+  take: number;
+  // Offset pagination; also counts all matches
+  skip?: number;
+  // Keyset pagination; seeks past the cursor through the ordering index and skips the count
+  after?: SearchCursor;
+}
+
+/**
+ * ORDER BY prefix for searches ranked by how well each row matches the query, if any
+ */
+function rankOrder(filters: ModpackSearchFilters): Prisma.Sql | null {
+  if (!filters.q) {
+    return null;
+  }
+
+  if (filters.mode === 'fuzzy') {
+    return Prisma.sql`similarity(m."name", ${filters.q}) DESC,`;
+  }
+
+  if ((filters.mode ?? 'fts') === 'fts' && filters.sort === 'relevance') {
+    return Prisma.sql`ts_rank_cd(${SEARCH_DOCUMENT}, plainto_tsquery('english', ${filters.q})) DESC,`;
+  }
+
+  return null;
+}
+
+/**
+ * Whether results are ordered by match quality, which cursor pagination can't seek through
+ */
+export function isRankedSearch(filters: ModpackSearchFilters): boolean {
+  return rankOrder(filters) !== null;
+}
+
+/**
+ * Find one page of matching modpack IDs, most downloaded first
+ * Ranked searches (fuzzy mode, or sort=relevance) order by match quality first and can't be paged by cursor
+ * One extra row is fetched to tell whether another page follows, so hasMore never needs a count
+ * total is only computed for offset pagination; nextCursor is null when no page follows
+ */
+export async function searchModpackIds(
+  filters: ModpackSearchFilters,
+  { take, skip = 0, after }: SearchPageOptions
+): Promise<{ ids: number[]; total: number | null; hasMore: boolean; nextCursor: string | null }> {
+  const where = buildModpackSearchWhere(filters);
+  const rank = rankOrder(filters);
+  const ranked = rank !== null;
+
+  const pageQuery = (condition: Prisma.Sql, offset: number) =>
+    prisma.$queryRaw<Array<{ id: number; downloads: number }>>`
+      SELECT m."id", m."downloads" FROM "modpacks" AS m
+      WHERE ${condition}
+      ORDER BY ${rank ?? Prisma.empty} m."downloads" DESC, m."id" DESC
+      LIMIT ${take + 1} OFFSET ${offset}
+    `;
+
+  let rows: Array<{ id: number; downloads: number }>;
+  let total: number | null = null;
+
+  if (after) {
+    rows = await pageQuery(
+      Prisma.sql`${where} AND (m."downloads", m."id") < (${after.downloads}, ${after.id})`,
+      0
+    );
+  } else {
+    const [pageRows, [count]] = await Promise.all([
+      pageQuery(where, skip),
+      prisma.$queryRaw<Array<{ total: number }>>`
+        SELECT count(*)::int AS total FROM "modpacks" AS m WHERE ${where}
+      `,
+    ]);
+    rows = pageRows;
+    total = count.total;
+  }
+
+  const hasMore = rows.length > take;
+  const page = hasMore ? rows.slice(0, take) : rows;
+  const last = page[page.length - 1];
+  const nextCursor =
+    hasMore && !ranked ? encodeSearchCursor({ downloads: last.downloads, id: last.id }) : null;
+
+  return { ids: page.map((row) => row.id), total, hasMore, nextCursor };
+}
+
+// Serialized /search responses, keyed by their normalized parameters
+const searchResponseCache = new TtlCache<string>(
+  config.SEARCH_CACHE_TTL_SECONDS * 1000,
+  config.SEARCH_CACHE_MAX_ENTRIES
+);
+
+export function searchCacheKey(
+  filters: ModpackSearchFilters,
+  pagination: { page: number; limit: number; cursor?: string }
+): string {
+  return JSON.stringify({ ...filters, ...pagination });
+}
+
+export function getCachedSearchResponse(key: string): string | undefined {
+  return searchResponseCache.get(key);
+}
+
+export function cacheSearchResponse(key: string, payload: string): void {
+  searchResponseCache.set(key, payload);
+}
+
+/**
+ * Drop all cached search responses
+ * Call after any write that changes what /search returns (modpacks, their tags, tag names)
+ */
+export function invalidateSearchCache(): void {
+  searchResponseCache.clear();
+}
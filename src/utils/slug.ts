@@ -1,8 +1,15 @@
+// Compiled once at module load
+const NON_SLUG_RUNS = /[^a-z0-9]+/g;
+const SEPARATOR = /[\s-]/;
+
+/**
+ * Build a URL slug from a name in a single pass over its lowercased form
+ * Each run of other characters becomes one dash if it contains whitespace or a dash
+ * and is dropped otherwise (e.g., apostrophes); runs at either edge are always dropped
+ */
 export function generateSlug(name: string): string {
-  return name
-    .toLowerCase()
-    .replace(/\s+/g, '-')
-    .replace(/[^a-z0-9-]/g, '')
-    .replace(/-+/g, '-')
-    .replace(/^-|-$/g, '');
+  const lower = name.toLowerCase();
+  return lower.replace(NON_SLUG_RUNS, (run: string, offset: number) =>
+    offset === 0 || offset + run.length === lower.length || !SEPARATOR.test(run) ? '' : '-'
+  );
 }
@@ -30,6 +30,20 @@ describe('Auth Routes', () => {
     expect(body.user.username).toBe('testuser');
   });
 
+  it('should reject registering an existing username', async () => {
+    const response = await app.inject({
+      method: 'POST',
+      url: '/auth/register',
+      payload: {
+        username: 'testuser',
+        email: 'other@example.com',
+        password: 'password123',
+      },
+    });
+
+    expect(response.statusCode).toBe(400);
+  });
+
   it('should login with valid credentials', async () => {
     const response = await app.inject({
       method: 'POST',
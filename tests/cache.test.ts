@@ -0,0 +1,50 @@
+import { describe, it, expect, vi, afterEach } from 'vitest';
+import { TtlCache } from '../src/utils/cache.js';
+
+describe('TtlCache', () => {
+  afterEach(() => {
+    vi.useRealTimers();
+  });
+
+  it('should return cached values until they expire', () => {
+    vi.useFakeTimers();
+    const cache = new TtlCache<string>(1000, 10);
+
+    cache.set('a', 'value');
+    expect(cache.get('a')).toBe('value');
+
+    vi.advanceTimersByTime(1000);
+    expect(cache.get('a')).toBeUndefined();
+    expect(cache.size).toBe(0);
+  });
+
+  it('should evict the oldest entry when full', () => {
+    const cache = new TtlCache<number>(60_000, 2);
+
+    cache.set('a', 1);
+    cache.set('b', 2);
+    cache.set('a', 3);
+    cache.set('c', 4);
+
+    expect(cache.get('b')).toBeUndefined();
+    expect(cache.get('a')).toBe(3);
+    expect(cache.get('c')).toBe(4);
+  });
+
+  it('should not store anything when the TTL is 0', () => {
+    const cache = new TtlCache<number>(0, 10);
+
+    cache.set('a', 1);
+    expect(cache.get('a')).toBeUndefined();
+  });
+
+  it('should drop all entries on clear', () => {
+    const cache = new TtlCache<number>(60_000, 10);
+
+    cache.set('a', 1);
+    cache.set('b', 2);
+    cache.clear();
+
+    expect(cache.size).toBe(0);
+  });
+});
@@ -0,0 +1,46 @@
+import { describe, it, expect } from 'vitest';
+import { FastifyRequest } from 'fastify';
+import { concurrencyLimit } from '../src/utils/concurrency.js';
+import { AppError } from '../src/utils/errors.js';
+
+function fakeRequest(client: string): FastifyRequest {
+  return { ip: client } as FastifyRequest;
+}
+
+describe('concurrencyLimit', () => {
+  it('should reject requests over the per-client limit', async () => {
+    const limit = concurrencyLimit(2, (request) => request.ip);
+
+    await limit.onRequest(fakeRequest('a'));
+    await limit.onRequest(fakeRequest('a'));
+
+    await expect(limit.onRequest(fakeRequest('a'))).rejects.toBeInstanceOf(AppError);
+    await expect(limit.onRequest(fakeRequest('b'))).resolves.toBeUndefined();
+  });
+
+  it('should free a slot when a request completes or is aborted', async () => {
+    const limit = concurrencyLimit(1, (request) => request.ip);
+    const first = fakeRequest('a');
+
+    await limit.onRequest(first);
+    await limit.onResponse(first);
+
+    const second = fakeRequest('a');
+    await limit.onRequest(second);
+    await limit.onRequestAbort(second);
+
+    await expect(limit.onRequest(fakeRequest('a'))).resolves.toBeUndefined();
+  });
+
+  it('should release each request only once', async () => {
+    const limit = concurrencyLimit(1, (request) => request.ip);
+    const first = fakeRequest('a');
+
+    await limit.onRequest(first);
+    await limit.onRequestAbort(first);
+    await limit.onResponse(first);
+
+    await limit.onRequest(fakeRequest('a'));
+    await expect(limit.onRequest(fakeRequest('a'))).rejects.toBeInstanceOf(AppError);
+  });
+});
@@ -0,0 +1,250 @@
+import { describe, it, expect, beforeAll, afterAll, beforeEach } from 'vitest';
+import { build } from './helper.js';
+import { FastifyInstance } from 'fastify';
+import { prisma } from '../src/prisma.js';
+import { flushDownloadCounts, isRedirectableDownloadUrl } from '../src/utils/downloads.js';
+
+describe('isRedirectableDownloadUrl', () => {
+  it('should redirect to uploaded files on this host', () => {
+    expect(isRedirectableDownloadUrl('/uploads/atm9-1.2.0.mrpack', 'api.example.com', [])).toBe(true);
+    expect(
+      isRedirectableDownloadUrl('https://api.example.com/uploads/atm9.mrpack', 'api.example.com', [])
+    ).toBe(true);
+  });
+
+  it('should not redirect to other paths or hosts that look like uploads', () => {
+    expect(isRedirectableDownloadUrl('https://api.example.com/other', 'api.example.com', [])).toBe(false);
+    expect(
+      isRedirectableDownloadUrl('https://evil.example.com/uploads/x', 'api.example.com', [])
+    ).toBe(false);
+    expect(isRedirectableDownloadUrl('//evil.example.com/uploads/x', 'api.example.com', [])).toBe(false);
+  });
+
+  it('should redirect to configured origins only', () => {
+    const origins = ['https://cdn.example.com'];
+    const host = 'api.example.com';
+
+    expect(isRedirectableDownloadUrl('https://cdn.example.com/atm9.mrpack', host, origins)).toBe(true);
+    expect(isRedirectableDownloadUrl('https://evil.example.com/atm9.mrpack', host, origins)).toBe(false);
+    expect(isRedirectableDownloadUrl('https://cdn.example.com.evil.test/x', host, origins)).toBe(false);
+    expect(isRedirectableDownloadUrl('not a url', host, origins)).toBe(false);
+  });
+});
+
+describe('Version Download Integration Tests', () => {
+  let app: FastifyInstance;
+  let authToken: string;
+  let userId: number;
+  let modpackId: number;
+
+  beforeAll(async () => {
+    app = await build();
+
+    const registerResponse = await app.inject({
+      method: 'POST',
+      url: '/auth/register',
+      payload: {
+        username: 'downloadtest',
+        email: 'downloadtest@example.com',
+        password: 'password123',
+      },
+    });
+
+    const registerBody = JSON.parse(registerResponse.body);
+    authToken = registerBody.accessToken;
+    userId = registerBody.user.id;
+  });
+
+  afterAll(async () => {
+    await prisma.modpack.deleteMany({
+      where: { authorId: userId },
+    });
+    await prisma.user.deleteMany({
+      where: { username: 'downloadtest' },
+    });
+    await app.close();
+  });
+
+  beforeEach(async () => {
+    // Leave nothing buffered from a previous test
+    await flushDownloadCounts();
+    await prisma.modpack.deleteMany({
+      where: { authorId: userId },
+    });
+
+    const modpack = await prisma.modpack.create({
+      data: {
+        name: 'Download Test Pack',
+        slug: 'download-test-pack',
+        mcVersion: '1.20.1',
+        loader: 'forge',
+        isPublished: true,
+        authorId: userId,
+      },
+    });
+    modpackId = modpack.id;
+  });
+
+  async function createVersion(version: string, downloadUrl: string) {
+    return prisma.modpackVersion.create({
+      data: {
+        modpackId,
+        version,
+        mcVersion: '1.20.1',
+        loader: 'forge',
+        downloadUrl,
+      },
+    });
+  }
+
+  async function download(versionId: number) {
+    return app.inject({
+      method: 'GET',
+      url: `/modpacks/download-test-pack/versions/${versionId}/download`,
+    });
+  }
+
+  async function deleteVersion(versionId: number) {
+    return app.inject({
+      method: 'DELETE',
+      url: `/modpacks/download-test-pack/versions/${versionId}`,
+      headers: { authorization: `Bearer ${authToken}` },
+    });
+  }
+
+  async function versionDownloadTotal(): Promise<number> {
+    const modpack = await prisma.modpack.findUniqueOrThrow({
+      where: { id: modpackId },
+      select: { versionDownloads: true },
+    });
+    return modpack.versionDownloads;
+  }
+
+  async function createVersionThroughApi(version: string, downloadUrl: string) {
+    const response = await app.inject({
+      method: 'POST',
+      url: '/modpacks/download-test-pack/versions',
+      headers: { authorization: `Bearer ${authToken}` },
+      payload: { version, mcVersion: '1.20.1', loader: 'forge', downloadUrl },
+    });
+    expect(response.statusCode).toBe(201);
+    return JSON.parse(response.body) as { id: number };
+  }
+
+  it('should redirect to upload paths saved through the API', async () => {
+    const version = await createVersionThroughApi('1.0.0', '/uploads/download-test.mrpack');
+
+    const response = await download(version.id);
+
+    expect(response.statusCode).toBe(302);
+    expect(response.headers.location).toBe('/uploads/download-test.mrpack');
+  });
+
+  it('should redirect to absolute upload URLs on the API host', async () => {
+    // app.inject sends requests with Host: localhost:80
+    const version = await createVersionThroughApi(
+      '1.0.0',
+      'http://localhost/uploads/download-test.mrpack'
+    );
+
+    const response = await download(version.id);
+
+    expect(response.statusCode).toBe(302);
+    expect(response.headers.location).toBe('http://localhost/uploads/download-test.mrpack');
+  });
+
+  it('should return external URLs as JSON instead of redirecting', async () => {
+    const version = await createVersion('1.0.0', 'https://evil.example.com/download-test.mrpack');
+
+    const response = await download(version.id);
+
+    expect(response.statusCode).toBe(200);
+    expect(response.headers.location).toBeUndefined();
+    expect(JSON.parse(response.body)).toEqual({
+      url: 'https://evil.example.com/download-test.mrpack',
+    });
+  });
+
+  it('should not serve downloads for unpublished modpacks', async () => {
+    const version = await createVersion('1.0.0', '/uploads/download-test.mrpack');
+    await prisma.modpack.update({ where: { id: modpackId }, data: { isPublished: false } });
+
+    const response = await download(version.id);
+
+    expect(response.statusCode).toBe(404);
+  });
+
+  it('should write buffered download counts for every version in one flush', async () => {
+    const first = await createVersion('1.0.0', '/uploads/download-test-1.mrpack');
+    const second = await createVersion('1.1.0', '/uploads/download-test-2.mrpack');
+
+    for (const versionId of [first.id, first.id, second.id]) {
+      await download(versionId);
+    }
+
+    // Nothing is written until the buffer is flushed
+    const before = await prisma.modpack.findUniqueOrThrow({ where: { id: modpackId } });
+    expect(before.downloads).toBe(0);
+
+    await flushDownloadCounts();
+
+    const modpack = await prisma.modpack.findUniqueOrThrow({
+      where: { id: modpackId },
+      omit: { versionDownloads: false },
+    });
+    const versions = await prisma.modpackVersion.findMany({
+      where: { modpackId },
+      orderBy: { id: 'asc' },
+    });
+
+    expect(modpack.downloads).toBe(3);
+    expect(modpack.versionDownloads).toBe(3);
+    expect(versions.map((v) => v.downloads)).toEqual([2, 1]);
+  });
+
+  it('should write buffered download counts when the server closes', async () => {
+    const closingApp = await build();
+    const version = await createVersion('1.0.0', '/uploads/download-test.mrpack');
+
+    await closingApp.inject({
+      method: 'GET',
+      url: `/modpacks/download-test-pack/versions/${version.id}/download`,
+    });
+    await closingApp.close();
+
+    const stored = await prisma.modpackVersion.findUniqueOrThrow({ where: { id: version.id } });
+    expect(stored.downloads).toBe(1);
+  });
+
+  it('should take a deleted version\'s downloads out of the modpack total', async () => {
+    const kept = await createVersion('1.0.0', '/uploads/download-test-1.mrpack');
+    const deleted = await createVersion('1.1.0', '/uploads/download-test-2.mrpack');
+
+    await download(kept.id);
+    await download(deleted.id);
+    await download(deleted.id);
+    await flushDownloadCounts();
+    expect(await versionDownloadTotal()).toBe(3);
+
+    expect((await deleteVersion(deleted.id)).statusCode).toBe(204);
+    expect(await versionDownloadTotal()).toBe(1);
+  });
+
+  it('should drop buffered counts for versions deleted before the flush', async () => {
+    const kept = await createVersion('1.0.0', '/uploads/download-test-1.mrpack');
+    const deleted = await createVersion('1.1.0', '/uploads/download-test-2.mrpack');
+
+    await download(kept.id);
+    await download(deleted.id);
+    expect((await deleteVersion(deleted.id)).statusCode).toBe(204);
+    await flushDownloadCounts();
+
+    const modpack = await prisma.modpack.findUniqueOrThrow({
+      where: { id: modpackId },
+      select: { downloads: true, versionDownloads: true },
+    });
+    // Every download still counts towards the modpack, but only existing versions add to the total
+    expect(modpack.downloads).toBe(2);
+    expect(modpack.versionDownloads).toBe(1);
+  });
+});
@@ -0,0 +1,65 @@
+import { describe, it, expect, beforeAll, afterAll } from 'vitest';
+import { mkdtemp, readFile, rm } from 'fs/promises';
+import { createWriteStream } from 'fs';
+import { Readable, Writable } from 'stream';
+import { pipeline } from 'stream/promises';
+import { tmpdir } from 'os';
+import { join } from 'path';
+import { HashStream } from '../src/utils/hash.js';
+
+/**
+ * Run chunks through a HashStream into a sink that discards them, and return the digest
+ */
+async function digestOf(chunks: Array<string | Buffer>, stream = new HashStream()): Promise<string> {
+  const sink = new Writable({
+    write(_chunk, _encoding, callback) {
+      callback();
+    },
+  });
+  await pipeline(Readable.from(chunks), stream, sink);
+  return stream.digest();
+}
+
+describe('HashStream', () => {
+  let dir: string;
+
+  beforeAll(async () => {
+    dir = await mkdtemp(join(tmpdir(), 'chunkhub-hash-'));
+  });
+
+  afterAll(async () => {
+    await rm(dir, { recursive: true, force: true });
+  });
+
+  it('should pass data through unchanged while hashing it', async () => {
+    const filepath = join(dir, 'streamed.txt');
+    const hashStream = new HashStream();
+
+    await pipeline(Readable.from(['hel', 'lo']), hashStream, createWriteStream(filepath));
+
+    expect(await readFile(filepath, 'utf8')).toBe('hello');
+    expect(hashStream.digest()).toBe(
+      'sha256:2cf24dba5fb0a30e26e83b2ac5b9e29e1b161e5c1fa7425e73043362938b9824'
+    );
+  });
+
+  it('should produce the same digest however the data is chunked', async () => {
+    const data = Buffer.alloc(3 << 20, 'chunk');
+
+    expect(await digestOf([data.subarray(0, 1), data.subarray(1, 70_000), data.subarray(70_000)])).toBe(
+      await digestOf([data])
+    );
+  });
+
+  it('should hash empty input', async () => {
+    expect(await digestOf([])).toBe(
+      'sha256:e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855'
+    );
+  });
+
+  it('should prefix the digest with the requested algorithm', async () => {
+    expect(await digestOf(['hello'], new HashStream('blake2b512'))).toBe(
+      'blake2b512:e4cfa39a3d37be31c59609e807970799caa68a19bfaa15135f165085e01d41a65ba1e1b146aeb6bd0092b49eac214c103ccfa3a365954bbbe52f74a2b3620c94'
+    );
+  });
+});
@@ -1,6 +1,8 @@
 import fastify, { FastifyInstance } from 'fastify';
 import { registerPlugins } from '../src/plugins/index.js';
 import { registerRoutes } from '../src/routes/index.js';
+import { invalidateSearchCache } from '../src/utils/search.js';
+import { invalidateAllModpackDetails } from '../src/utils/modpackCache.js';
 
 export async function build(): Promise<FastifyInstance> {
   const app = fastify({
@@ -12,3 +14,12 @@ export async function build(): Promise<FastifyInstance> {
 
   return app;
 }
+
+/**
+ * Clear the in-memory response caches
+ * Tests that seed rows through prisma bypass the routes that would invalidate them
+ */
+export function resetCaches(): void {
+  invalidateSearchCache();
+  invalidateAllModpackDetails();
+}
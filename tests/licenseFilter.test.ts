@@ -1,5 +1,5 @@
 import { describe, it, expect, beforeAll, afterAll, beforeEach } from 'vitest';
-import { build } from './helper.js';
+import { build, resetCaches } from './helper.js';
 import { FastifyInstance } from 'fastify';
 import { prisma } from '../src/prisma.js';
 
@@ -43,6 +43,7 @@ describe('License Filtering Integration Tests', () => {
     await prisma.modpack.deleteMany({
       where: { authorId: userId },
     });
+    resetCaches();
   });
 
   describe('GET /modpacks - License Filtering', () => {
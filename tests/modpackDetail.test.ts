@@ -0,0 +1,246 @@
+import { describe, it, expect, beforeAll, afterAll, beforeEach } from 'vitest';
+import { build, resetCaches } from './helper.js';
+import { FastifyInstance } from 'fastify';
+import { prisma } from '../src/prisma.js';
+import {
+  getCachedModpackDetail,
+  modpackDetailGeneration,
+  cacheModpackDetail,
+  invalidateModpackDetail,
+  invalidateAllModpackDetails,
+} from '../src/utils/modpackCache.js';
+
+const SLUG = 'detail-cache-pack';
+
+describe('modpack detail cache', () => {
+  beforeEach(() => {
+    invalidateAllModpackDetails();
+  });
+
+  it('should not cache a read that started before the slug was invalidated', () => {
+    // A GET reads the published modpack, then a PATCH unpublishes it before the GET caches
+    const generation = modpackDetailGeneration('detail-cache-race');
+    invalidateModpackDetail('detail-cache-race');
+    cacheModpackDetail('detail-cache-race', '{"isPublished":true}', generation);
+
+    expect(getCachedModpackDetail('detail-cache-race')).toBeUndefined();
+
+    // The next read starts after the invalidation and is cached as usual
+    const nextGeneration = modpackDetailGeneration('detail-cache-race');
+    cacheModpackDetail('detail-cache-race', '{"isPublished":false}', nextGeneration);
+    expect(getCachedModpackDetail('detail-cache-race')).toBe('{"isPublished":false}');
+  });
+
+  it('should not cache a read that started before every slug was invalidated', () => {
+    const generation = modpackDetailGeneration('detail-cache-race');
+    invalidateAllModpackDetails();
+    cacheModpackDetail('detail-cache-race', '{}', generation);
+
+    expect(getCachedModpackDetail('detail-cache-race')).toBeUndefined();
+  });
+
+  it('should still cache reads when other slugs are invalidated', () => {
+    const generation = modpackDetailGeneration('detail-cache-race');
+    invalidateModpackDetail('detail-cache-other');
+    cacheModpackDetail('detail-cache-race', '{}', generation);
+
+    expect(getCachedModpackDetail('detail-cache-race')).toBe('{}');
+  });
+});
+
+describe('Modpack Detail Cache Integration Tests', () => {
+  let app: FastifyInstance;
+  let authToken: string;
+  let userId: number;
+  let modpackId: number;
+
+  beforeAll(async () => {
+    app = await build();
+
+    const registerResponse = await app.inject({
+      method: 'POST',
+      url: '/auth/register',
+      payload: {
+        username: 'detailcachetest',
+        email: 'detailcachetest@example.com',
+        password: 'password123',
+      },
+    });
+
+    const registerBody = JSON.parse(registerResponse.body);
+    authToken = registerBody.accessToken;
+    userId = registerBody.user.id;
+  });
+
+  afterAll(async () => {
+    await prisma.modpack.deleteMany({
+      where: { authorId: userId },
+    });
+    await prisma.tag.deleteMany({
+      where: { slug: { startsWith: 'detail-cache-' } },
+    });
+    await prisma.user.deleteMany({
+      where: { username: 'detailcachetest' },
+    });
+    await app.close();
+  });
+
+  beforeEach(async () => {
+    await prisma.modpack.deleteMany({
+      where: { authorId: userId },
+    });
+    await prisma.tag.deleteMany({
+      where: { slug: { startsWith: 'detail-cache-' } },
+    });
+    resetCaches();
+
+    const modpack = await prisma.modpack.create({
+      data: {
+        name: 'Detail Cache Pack',
+        slug: SLUG,
+        description: 'Original description',
+        mcVersion: '1.20.1',
+        loader: 'forge',
+        isPublished: true,
+        authorId: userId,
+      },
+    });
+    modpackId = modpack.id;
+  });
+
+  async function getDetail() {
+    const response = await app.inject({
+      method: 'GET',
+      url: `/modpacks/${SLUG}`,
+    });
+    expect(response.statusCode).toBe(200);
+    return JSON.parse(response.body);
+  }
+
+  function authorized(method: 'POST' | 'PATCH' | 'DELETE', url: string, payload?: object) {
+    return app.inject({
+      method,
+      url,
+      headers: { authorization: `Bearer ${authToken}` },
+      payload,
+    });
+  }
+
+  async function createTag(name: string) {
+    const response = await authorized('POST', '/tags', {
+      name,
+      slug: `detail-cache-${name.toLowerCase()}`,
+      type: 'CUSTOM',
+    });
+    expect(response.statusCode).toBe(201);
+    return JSON.parse(response.body) as { id: number; name: string };
+  }
+
+  it('should serve the cached detail until the modpack is written through the API', async () => {
+    expect((await getDetail()).description).toBe('Original description');
+
+    // Written directly, so nothing invalidates the cached response
+    await prisma.modpack.update({
+      where: { id: modpackId },
+      data: { description: 'Changed behind the cache' },
+    });
+    expect((await getDetail()).description).toBe('Original description');
+
+    const response = await authorized('PATCH', `/modpacks/${SLUG}`, {
+      description: 'Patched description',
+    });
+    expect(response.statusCode).toBe(200);
+
+    expect((await getDetail()).description).toBe('Patched description');
+  });
+
+  it('should not include the version download total outside downloadStats', async () => {
+    const detail = await getDetail();
+
+    expect(detail).not.toHaveProperty('versionDownloads');
+    expect(detail.downloadStats).toEqual({ totalDownloads: 0, versionDownloads: 0 });
+  });
+
+  it('should leave the version download total out of other modpack responses', async () => {
+    const tag = await createTag('Quiet');
+    const responses = [
+      await app.inject({ method: 'GET', url: '/modpacks' }),
+      await app.inject({ method: 'GET', url: '/projects/detailcachetest' }),
+      await authorized('PATCH', `/modpacks/${SLUG}`, { description: 'Patched description' }),
+      await authorized('POST', `/modpacks/${SLUG}/tags`, { tagIds: [tag.id] }),
+      await authorized('POST', '/modpacks', {
+        name: 'Detail Cache Created Pack',
+        mcVersion: '1.20.1',
+        loader: 'forge',
+      }),
+    ];
+
+    for (const response of responses) {
+      expect(response.statusCode).toBeLessThan(300);
+      expect(response.body).not.toContain('versionDownloads');
+    }
+  });
+
+  it('should refresh the detail when versions are created and deleted', async () => {
+    expect((await getDetail()).versions).toEqual([]);
+
+    const createResponse = await authorized('POST', `/modpacks/${SLUG}/versions`, {
+      version: '1.0.0',
+      mcVersion: '1.20.1',
+      loader: 'forge',
+    });
+    expect(createResponse.statusCode).toBe(201);
+    const version = JSON.parse(createResponse.body);
+
+    expect((await getDetail()).versions.map((v: { version: string }) => v.version)).toEqual([
+      '1.0.0',
+    ]);
+
+    const deleteResponse = await authorized('DELETE', `/modpacks/${SLUG}/versions/${version.id}`);
+    expect(deleteResponse.statusCode).toBe(204);
+
+    expect((await getDetail()).versions).toEqual([]);
+  });
+
+  it('should refresh the detail when version details change', async () => {
+    const version = await prisma.modpackVersion.create({
+      data: { modpackId, version: '1.0.0', mcVersion: '1.20.1', loader: 'forge' },
+    });
+    await getDetail();
+
+    const response = await authorized('PATCH', `/modpacks/${SLUG}/versions/${version.id}`, {
+      changelog: 'Fixed crashes',
+    });
+    expect(response.statusCode).toBe(200);
+
+    expect((await getDetail()).versions[0].changelog).toBe('Fixed crashes');
+  });
+
+  it('should refresh the detail when tags are added, renamed and removed', async () => {
+    const tag = await createTag('Cozy');
+    expect((await getDetail()).tags).toEqual([]);
+
+    const addResponse = await authorized('POST', `/modpacks/${SLUG}/tags`, { tagIds: [tag.id] });
+    expect(addResponse.statusCode).toBe(200);
+    expect((await getDetail()).tags.map((t: { name: string }) => t.name)).toEqual(['Cozy']);
+
+    const renameResponse = await authorized('PATCH', `/tags/${tag.id}`, { name: 'Comfy' });
+    expect(renameResponse.statusCode).toBe(200);
+    expect((await getDetail()).tags.map((t: { name: string }) => t.name)).toEqual(['Comfy']);
+
+    const removeResponse = await authorized('DELETE', `/modpacks/${SLUG}/tags/${tag.id}`);
+    expect(removeResponse.statusCode).toBe(204);
+    expect((await getDetail()).tags).toEqual([]);
+  });
+
+  it('should refresh the detail when a tag is deleted', async () => {
+    const tag = await createTag('Spooky');
+    await authorized('POST', `/modpacks/${SLUG}/tags`, { tagIds: [tag.id] });
+    expect((await getDetail()).tags).toHaveLength(1);
+
+    const response = await authorized('DELETE', `/tags/${tag.id}`);
+    expect(response.statusCode).toBe(204);
+
+    expect((await getDetail()).tags).toEqual([]);
+  });
+});
@@ -0,0 +1,117 @@
+import { describe, it, expect } from 'vitest';
+import {
+  buildModpackSearchWhere,
+  escapeLikePattern,
+  encodeSearchCursor,
+  decodeSearchCursor,
+  isRankedSearch,
+  isSearchQueryTooShort,
+} from '../src/utils/search.js';
+
+describe('buildModpackSearchWhere', () => {
+  it('should only match published modpacks by default', () => {
+    const where = buildModpackSearchWhere({});
+
+    expect(where.sql).toBe('m."is_published" = true');
+    expect(where.values).toEqual([]);
+  });
+
+  it('should use full-text search for the text query', () => {
+    const where = buildModpackSearchWhere({ q: 'tech magic' });
+
+    expect(where.sql).toContain('m."search_vector" @@ plainto_tsquery(\'english\', ?)');
+    expect(where.sql).not.toContain('ILIKE');
+    expect(where.values).toEqual(['tech magic']);
+  });
+
+  it('should bind every filter value as a parameter', () => {
+    const where = buildModpackSearchWhere({
+      mcVersion: '1.20.1',
+      loader: 'forge',
+      projectType: 'MOD',
+      licenseIds: ['MIT', 'Apache-2.0'],
+      tagSlugs: ['magic'],
+    });
+
+    expect(where.values).toEqual(['1.20.1', 'forge', 'MOD', ['MIT', 'Apache-2.0'], ['magic']]);
+    expect(where.sql).toContain('CAST(? AS "ProjectType")');
+    expect(where.sql).toContain('EXISTS');
+  });
+
+  it('should produce the same SQL regardless of how many tags or licenses are given', () => {
+    const one = buildModpackSearchWhere({ licenseIds: ['MIT'], tagSlugs: ['magic'] });
+    const many = buildModpackSearchWhere({
+      licenseIds: ['MIT', 'Apache-2.0', 'BSD-3-Clause'],
+      tagSlugs: ['magic', 'tech'],
+    });
+
+    expect(many.sql).toBe(one.sql);
+  });
+});
+
+describe('fuzzy search mode', () => {
+  it('should match names by trigram similarity and substrings', () => {
+    const where = buildModpackSearchWhere({ q: 'modpa', mode: 'fuzzy' });
+
+    expect(where.sql).toContain('m."name" % ?');
+    expect(where.sql).toContain('ILIKE ?');
+    expect(where.sql).not.toContain('plainto_tsquery');
+    expect(where.values).toEqual(['modpa', '%modpa%', '%modpa%']);
+  });
+
+  it('should escape LIKE wildcards in the query', () => {
+    expect(escapeLikePattern('100%_done\\')).toBe('100\\%\\_done\\\\');
+  });
+});
+
+describe('prefix search mode', () => {
+  it('should match the start of the lowercased name', () => {
+    const where = buildModpackSearchWhere({ q: 'All_The', mode: 'prefix' });
+
+    expect(where.sql).toContain('lower(m."name") LIKE lower(?)');
+    expect(where.sql).not.toContain('ILIKE');
+    expect(where.values).toEqual(['All\\_The%']);
+  });
+});
+
+describe('search cursors', () => {
+  it('should round-trip through an opaque string', () => {
+    const encoded = encodeSearchCursor({ downloads: 15420, id: 1 });
+
+    expect(encoded).toMatch(/^[A-Za-z0-9_-]+$/);
+    expect(decodeSearchCursor(encoded)).toEqual({ downloads: 15420, id: 1 });
+  });
+
+  it('should reject malformed cursors', () => {
+    expect(decodeSearchCursor('not-a-cursor')).toBeNull();
+    expect(decodeSearchCursor(Buffer.from('1.2.3').toString('base64url'))).toBeNull();
+    expect(decodeSearchCursor('')).toBeNull();
+  });
+});
+
+describe('isRankedSearch', () => {
+  it('should rank fuzzy searches and relevance-sorted text searches', () => {
+    expect(isRankedSearch({ q: 'magic', mode: 'fuzzy' })).toBe(true);
+    expect(isRankedSearch({ q: 'magic', mode: 'fts', sort: 'relevance' })).toBe(true);
+  });
+
+  it('should order other searches by downloads', () => {
+    expect(isRankedSearch({ q: 'magic', mode: 'fts' })).toBe(false);
+    expect(isRankedSearch({ q: 'magic', mode: 'prefix', sort: 'relevance' })).toBe(false);
+    expect(isRankedSearch({ sort: 'relevance' })).toBe(false);
+  });
+});
+
+describe('isSearchQueryTooShort', () => {
+  it('should reject queries with fewer than three real characters', () => {
+    expect(isSearchQueryTooShort('a')).toBe(true);
+    expect(isSearchQueryTooShort('ab')).toBe(true);
+    expect(isSearchQueryTooShort('%%%')).toBe(true);
+    expect(isSearchQueryTooShort('a_%b')).toBe(true);
+  });
+
+  it('should accept queries with at least three real characters', () => {
+    expect(isSearchQueryTooShort('atm')).toBe(false);
+    expect(isSearchQueryTooShort('all the mods')).toBe(false);
+  });
+});
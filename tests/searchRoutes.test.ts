@@ -0,0 +1,290 @@
+import { describe, it, expect, beforeAll, afterAll, beforeEach } from 'vitest';
+import { build, resetCaches } from './helper.js';
+import { FastifyInstance } from 'fastify';
+import { prisma } from '../src/prisma.js';
+
+// Every modpack in this file uses this loader, and every search filters on it,
+// so rows seeded by other test files never show up in the results
+const LOADER = 'searchroutes';
+
+interface SeedModpack {
+  name: string;
+  description?: string;
+  downloads?: number;
+}
+
+describe('Search Route Integration Tests', () => {
+  let app: FastifyInstance;
+  let authToken: string;
+  let userId: number;
+
+  beforeAll(async () => {
+    app = await build();
+
+    const registerResponse = await app.inject({
+      method: 'POST',
+      url: '/auth/register',
+      payload: {
+        username: 'searchroutetest',
+        email: 'searchroutetest@example.com',
+        password: 'password123',
+      },
+    });
+
+    const registerBody = JSON.parse(registerResponse.body);
+    authToken = registerBody.accessToken;
+    userId = registerBody.user.id;
+  });
+
+  afterAll(async () => {
+    await prisma.modpack.deleteMany({
+      where: { authorId: userId },
+    });
+    await prisma.user.deleteMany({
+      where: { username: 'searchroutetest' },
+    });
+    await app.close();
+  });
+
+  beforeEach(async () => {
+    await prisma.modpack.deleteMany({
+      where: { authorId: userId },
+    });
+    resetCaches();
+  });
+
+  async function seed(modpacks: SeedModpack[]) {
+    await prisma.modpack.createMany({
+      data: modpacks.map((modpack, i) => ({
+        ...modpack,
+        slug: `search-routes-${i}`,
+        mcVersion: '1.20.1',
+        loader: LOADER,
+        isPublished: true,
+        authorId: userId,
+      })),
+    });
+  }
+
+  async function search(query: string) {
+    const response = await app.inject({
+      method: 'GET',
+      url: `/search?loader=${LOADER}${query ? `&${query}` : ''}`,
+    });
+    return { statusCode: response.statusCode, body: JSON.parse(response.body) };
+  }
+
+  function names(body: { data: Array<{ name: string }> }): string[] {
+    return body.data.map((modpack) => modpack.name);
+  }
+
+  describe('response cache', () => {
+    it('should serve cached results until a write clears them', async () => {
+      await seed([{ name: 'Cached Pack' }]);
+      expect(names((await search('')).body)).toEqual(['Cached Pack']);
+
+      // Seeded directly, so nothing invalidates the cached response
+      await prisma.modpack.create({
+        data: {
+          name: 'Uncached Pack',
+          slug: 'search-routes-uncached',
+          mcVersion: '1.20.1',
+          loader: LOADER,
+          isPublished: true,
+          authorId: userId,
+        },
+      });
+      expect(names((await search('')).body)).toEqual(['Cached Pack']);
+
+      // Any modpack write through the API clears the search cache
+      const patchResponse = await app.inject({
+        method: 'PATCH',
+        url: '/modpacks/search-routes-0',
+        headers: { authorization: `Bearer ${authToken}` },
+        payload: { description: 'Updated' },
+      });
+      expect(patchResponse.statusCode).toBe(200);
+
+      expect(names((await search('')).body).sort()).toEqual(['Cached Pack', 'Uncached Pack']);
+    });
+  });
+
+  describe('full-text search', () => {
+    it('should match other forms of the same word', async () => {
+      await seed([
+        { name: 'Magical Adventures', description: 'Spells and wizardry' },
+        { name: 'Tech Factory', description: 'Machines and automation' },
+      ]);
+
+      const { statusCode, body } = await search('q=magic');
+
+      expect(statusCode).toBe(200);
+      expect(names(body)).toEqual(['Magical Adventures']);
+    });
+
+    it('should match words in the description', async () => {
+      await seed([
+        { name: 'Skyblock Pack', description: 'Automated factories in the sky' },
+        { name: 'Quest Pack', description: 'Story driven quests' },
+      ]);
+
+      const { body } = await search('q=factory');
+
+      expect(names(body)).toEqual(['Skyblock Pack']);
+    });
+  });
+
+  describe('fuzzy search', () => {
+    it('should match partial words and typos in the name', async () => {
+      await seed([{ name: 'Modpack' }, { name: 'Tech Factory' }]);
+
+      const partial = await search('q=modpa&mode=fuzzy');
+      const typo = await search('q=modpak&mode=fuzzy');
+
+      expect(partial.statusCode).toBe(200);
+      expect(names(partial.body)).toEqual(['Modpack']);
+      expect(typo.statusCode).toBe(200);
+      expect(names(typo.body)).toEqual(['Modpack']);
+    });
+
+    it('should match substrings of the description', async () => {
+      await seed([
+        { name: 'Skyblock Pack', description: 'Automated factories in the sky' },
+        { name: 'Quest Pack', description: 'Story driven quests' },
+      ]);
+
+      const { body } = await search('q=actori&mode=fuzzy');
+
+      expect(names(body)).toEqual(['Skyblock Pack']);
+    });
+  });
+
+  it('should reject an unknown search mode', async () => {
+    const { statusCode, body } = await search('q=magic&mode=regex');
+
+    expect(statusCode).toBe(400);
+    expect(body.message).toContain('Invalid search mode');
+  });
+
+  describe('prefix search', () => {
+    it('should match the start of the name regardless of case', async () => {
+      await seed([{ name: 'All The Mods 9' }, { name: 'Mods For All' }]);
+
+      const { statusCode, body } = await search('q=aLL%20the&mode=prefix');
+
+      expect(statusCode).toBe(200);
+      expect(names(body)).toEqual(['All The Mods 9']);
+    });
+
+    it('should treat LIKE wildcards in the query literally', async () => {
+      await seed([{ name: 'All_The Pack' }, { name: 'AllXThe Pack' }]);
+
+      const underscore = await search('q=all_the&mode=prefix');
+      const percent = await search('q=all%25the&mode=prefix');
+
+      expect(names(underscore.body)).toEqual(['All_The Pack']);
+      expect(percent.statusCode).toBe(200);
+      expect(percent.body.data).toEqual([]);
+    });
+  });
+
+  describe('cursor pagination', () => {
+    // Ordered by downloads, then by id, both descending; the tied rows come back newest first
+    const expectedOrder = [
+      'Most Downloaded Pack',
+      'Tied Pack Three',
+      'Tied Pack Two',
+      'Tied Pack One',
+      'Least Downloaded Pack',
+    ];
+
+    beforeEach(async () => {
+      await seed([
+        { name: 'Most Downloaded Pack', downloads: 50 },
+        { name: 'Tied Pack One', downloads: 30 },
+        { name: 'Tied Pack Two', downloads: 30 },
+        { name: 'Tied Pack Three', downloads: 30 },
+        { name: 'Least Downloaded Pack', downloads: 10 },
+      ]);
+    });
+
+    it('should return every result exactly once when following cursors', async () => {
+      const first = await search('limit=2');
+      const seen = names(first.body);
+      let cursor: string | null = first.body.pagination.nextCursor;
+
+      while (cursor) {
+        const page = await search(`limit=2&cursor=${cursor}`);
+        expect(page.statusCode).toBe(200);
+        seen.push(...names(page.body));
+        cursor = page.body.pagination.nextCursor;
+      }
+
+      expect(seen).toEqual(expectedOrder);
+    });
+
+    it('should seek past ties on downloads without skipping rows', async () => {
+      // Stop in the middle of the tied rows
+      const first = await search('limit=2');
+      const second = await search(`limit=2&cursor=${first.body.pagination.nextCursor}`);
+
+      expect(names(first.body)).toEqual(expectedOrder.slice(0, 2));
+      expect(names(second.body)).toEqual(expectedOrder.slice(2, 4));
+    });
+
+    it('should only count results for offset pages', async () => {
+      const first = await search('limit=2');
+      const second = await search(`limit=2&cursor=${first.body.pagination.nextCursor}`);
+
+      expect(first.body.pagination).toMatchObject({ page: 1, limit: 2, total: 5, pages: 3 });
+      expect(second.body.pagination).not.toHaveProperty('total');
+      expect(second.body.pagination).not.toHaveProperty('pages');
+      expect(second.body.pagination).not.toHaveProperty('page');
+      expect(second.body.pagination.limit).toBe(2);
+    });
+
+    it('should report no further pages on the last cursor page', async () => {
+      const first = await search('limit=2');
+      const second = await search(`limit=2&cursor=${first.body.pagination.nextCursor}`);
+      const last = await search(`limit=2&cursor=${second.body.pagination.nextCursor}`);
+
+      expect(first.body.pagination.hasMore).toBe(true);
+      expect(second.body.pagination.hasMore).toBe(true);
+      expect(names(last.body)).toEqual(expectedOrder.slice(4));
+      expect(last.body.pagination.hasMore).toBe(false);
+      expect(last.body.pagination.nextCursor).toBeNull();
+    });
+
+    it('should tell whether more results follow from the extra fetched row', async () => {
+      const oneLeft = await search('limit=4');
+      const exactFit = await search('limit=5');
+      const lastOffsetPage = await search('limit=2&page=3');
+
+      expect(oneLeft.body.pagination.hasMore).toBe(true);
+      expect(oneLeft.body.data).toHaveLength(4);
+      expect(exactFit.body.pagination.hasMore).toBe(false);
+      expect(exactFit.body.pagination.nextCursor).toBeNull();
+      expect(exactFit.body.data).toHaveLength(5);
+      expect(lastOffsetPage.body.pagination.hasMore).toBe(false);
+      expect(names(lastOffsetPage.body)).toEqual(expectedOrder.slice(4));
+    });
+
+    it('should reject cursors for ranked searches', async () => {
+      const first = await search('limit=2');
+      const cursor = first.body.pagination.nextCursor;
+
+      const fuzzy = await search(`q=pack&mode=fuzzy&cursor=${cursor}`);
+      const relevance = await search(`q=pack&sort=relevance&cursor=${cursor}`);
+
+      expect(fuzzy.statusCode).toBe(400);
+      expect(relevance.statusCode).toBe(400);
+    });
+
+    it('should reject malformed cursors', async () => {
+      const { statusCode, body } = await search('cursor=not-a-cursor');
+
+      expect(statusCode).toBe(400);
+      expect(body.message).toBe('Invalid cursor');
+    });
+  });
+});
@@ -0,0 +1,29 @@
+import { describe, it, expect } from 'vitest';
+import { generateSlug } from '../src/utils/slug.js';
+
+describe('Slug Utilities', () => {
+  describe('generateSlug', () => {
+    it('should lowercase and hyphenate names', () => {
+      expect(generateSlug('All The Mods 9')).toBe('all-the-mods-9');
+    });
+
+    it('should drop disallowed characters', () => {
+      expect(generateSlug("Steve's Pack: Remastered!")).toBe('steves-pack-remastered');
+      expect(generateSlug('Café Craft')).toBe('caf-craft');
+    });
+
+    it('should collapse whitespace and dash runs', () => {
+      expect(generateSlug('Create  --  Above\tand Beyond')).toBe('create-above-and-beyond');
+      expect(generateSlug('a ! b')).toBe('a-b');
+    });
+
+    it('should trim leading and trailing dashes', () => {
+      expect(generateSlug('  -Vault Hunters-  ')).toBe('vault-hunters');
+    });
+
+    it('should return the same result on repeated calls', () => {
+      expect(generateSlug('Better MC')).toBe('better-mc');
+      expect(generateSlug('Better MC')).toBe('better-mc');
+    });
+  });
+});
@@ -0,0 +1,155 @@
+import { describe, it, expect, beforeAll, afterAll } from 'vitest';
+import { build } from './helper.js';
+import { FastifyInstance } from 'fastify';
+import { Prisma } from '@prisma/client';
+import { prisma } from '../src/prisma.js';
+import { isUniqueConstraintError } from '../src/utils/errors.js';
+
+describe('isUniqueConstraintError', () => {
+  it('should only match unique constraint violations', () => {
+    const clientVersion = Prisma.prismaVersion.client;
+
+    expect(
+      isUniqueConstraintError(
+        new Prisma.PrismaClientKnownRequestError('Unique constraint failed', { code: 'P2002', clientVersion })
+      )
+    ).toBe(true);
+    expect(
+      isUniqueConstraintError(
+        new Prisma.PrismaClientKnownRequestError('Record not found', { code: 'P2025', clientVersion })
+      )
+    ).toBe(false);
+    expect(isUniqueConstraintError(new Error('P2002'))).toBe(false);
+  });
+});
+
+describe('Version Routes Integration Tests', () => {
+  let app: FastifyInstance;
+  let authToken: string;
+  let userId: number;
+
+  beforeAll(async () => {
+    app = await build();
+
+    const registerResponse = await app.inject({
+      method: 'POST',
+      url: '/auth/register',
+      payload: {
+        username: 'versiontest',
+        email: 'versiontest@example.com',
+        password: 'password123',
+      },
+    });
+
+    const registerBody = JSON.parse(registerResponse.body);
+    authToken = registerBody.accessToken;
+    userId = registerBody.user.id;
+
+    await prisma.modpack.create({
+      data: {
+        name: 'Version Test Pack',
+        slug: 'version-test-pack',
+        mcVersion: '1.20.1',
+        loader: 'forge',
+        isPublished: true,
+        authorId: userId,
+        versions: {
+          create: [
+            { version: '1.0.0', mcVersion: '1.20.1', loader: 'forge', createdAt: new Date('2024-01-01') },
+            {
+              version: '1.1.0-beta',
+              mcVersion: '1.20.1',
+              loader: 'forge',
+              isStable: false,
+              createdAt: new Date('2024-02-01'),
+            },
+          ],
+        },
+      },
+    });
+  });
+
+  afterAll(async () => {
+    await prisma.modpack.deleteMany({
+      where: { authorId: userId },
+    });
+    await prisma.user.deleteMany({
+      where: { username: 'versiontest' },
+    });
+    await app.close();
+  });
+
+  it('should list all versions newest first', async () => {
+    const response = await app.inject({
+      method: 'GET',
+      url: '/modpacks/version-test-pack/versions',
+    });
+
+    expect(response.statusCode).toBe(200);
+    const body = JSON.parse(response.body);
+    expect(body.map((v: { version: string }) => v.version)).toEqual(['1.1.0-beta', '1.0.0']);
+  });
+
+  it('should list only stable versions with stableOnly', async () => {
+    const response = await app.inject({
+      method: 'GET',
+      url: '/modpacks/version-test-pack/versions?stableOnly=true',
+    });
+
+    expect(response.statusCode).toBe(200);
+    const body = JSON.parse(response.body);
+    expect(body.map((v: { version: string }) => v.version)).toEqual(['1.0.0']);
+  });
+
+  it('should return the latest version, optionally stable only', async () => {
+    const latest = await app.inject({
+      method: 'GET',
+      url: '/modpacks/version-test-pack/versions/latest',
+    });
+    const latestStable = await app.inject({
+      method: 'GET',
+      url: '/modpacks/version-test-pack/versions/latest?stableOnly=true',
+    });
+
+    expect(latest.statusCode).toBe(200);
+    expect(JSON.parse(latest.body).version).toBe('1.1.0-beta');
+    expect(latestStable.statusCode).toBe(200);
+    expect(JSON.parse(latestStable.body).version).toBe('1.0.0');
+  });
+
+  it('should reject a duplicate version name with 400', async () => {
+    const response = await app.inject({
+      method: 'POST',
+      url: '/modpacks/version-test-pack/versions',
+      headers: { authorization: `Bearer ${authToken}` },
+      payload: { version: '1.0.0', mcVersion: '1.20.1', loader: 'forge' },
+    });
+
+    expect(response.statusCode).toBe(400);
+    expect(JSON.parse(response.body).message).toBe('A version with this name already exists');
+  });
+
+  it('should hide versions of unpublished modpacks from other users', async () => {
+    const draft = await prisma.modpack.create({
+      data: {
+        name: 'Version Test Draft',
+        slug: 'version-test-draft',
+        mcVersion: '1.20.1',
+        loader: 'forge',
+        authorId: userId,
+        versions: { create: { version: '0.1.0', mcVersion: '1.20.1', loader: 'forge' } },
+      },
+      include: { versions: true },
+    });
+
+    const urls = [
+      '/modpacks/version-test-draft/versions',
+      '/modpacks/version-test-draft/versions/latest',
+      `/modpacks/version-test-draft/versions/${draft.versions[0].id}`,
+    ];
+    for (const url of urls) {
+      const response = await app.inject({ method: 'GET', url });
+      expect(response.statusCode).toBe(404);
+    }
+  });
+});